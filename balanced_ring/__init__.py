@@ -0,0 +1,48 @@
+"""
+Balanced Ring: circular arrays and self-balancing rings traversed with the (+k, +1, -k, +1) pattern.
+
+Submodules are imported on first attribute access, so `import balanced_ring` stays cheap:
+
+    from balanced_ring import SelfBalancingRing
+
+Run `python -m balanced_ring` for a short demonstration.
+"""
+import importlib
+
+# Map of public names to the submodule defining them.
+_EXPORTS = {
+    'BalancedRing': 'ring',
+    'CompactBalancedRing': 'compact',
+    'SelfBalancingRing': 'self_balancing',
+    'Sequence': 'sequence',
+    'analyze': 'sequence',
+    'LoadIndex': 'load_index',
+    'MigrationPlan': 'migration',
+    'ConcurrentRing': 'snapshot',
+    'RoutingSnapshot': 'snapshot',
+    'Instrumentation': 'instrumentation',
+    'Histogram': 'instrumentation',
+    'HashRing': 'routing',
+    'RingDescriptor': 'routing',
+    'MappedRing': 'persistence',
+    'save_snapshot': 'persistence',
+    'load_snapshot': 'persistence',
+    'HotKeyTracker': 'hot_keys',
+    'HierarchicalRing': 'hierarchical',
+    'RingServer': 'service',
+    'RingClient': 'service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value  # Cache, so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
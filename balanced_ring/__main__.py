@@ -0,0 +1,40 @@
+"""
+Demonstrations of the traversal, run with `python -m balanced_ring`.
+"""
+from .ring import BalancedRing
+from .sequence import Sequence
+
+
+def ring_demo():
+    balanced_ring = BalancedRing(size=9)
+
+    # Generate a traversal sequence of specified length
+    traversal_sequence = balanced_ring.traverse(length=20)
+    print("Traversal Sequence:", traversal_sequence)
+
+    # Insert and lookup values in the circular array
+    balanced_ring.insert("key1", "A")
+    print("lookup 'key1':", balanced_ring.lookup("key1"))
+
+    # Get the next and previous indices based on the traversal pattern
+    print("Current Index:", balanced_ring.current)
+    print("Previous Index:", balanced_ring.previous())
+    print("Previous Index:", balanced_ring.previous())
+    print("Next Index:", balanced_ring.next())
+    print("Next Index:", balanced_ring.next())
+    print("Next Index:", balanced_ring.next())
+
+
+def sequence_demo():
+    s = Sequence(17)
+    # Runs the traversal for a fixed length
+    sequence, num_visits = s.generate(178)
+
+    print("Sequence:", sequence)
+    print("Number of visits:", num_visits)
+    print("Next node:", s.next())
+
+
+if __name__ == '__main__':
+    ring_demo()
+    sequence_demo()
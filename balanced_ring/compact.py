@@ -0,0 +1,144 @@
+import math
+from array import array
+
+from .free_index import FreeIndex
+from .ring import BalancedRing
+from .traversal import period_length
+
+'''
+The CompactBalancedRing is a BalancedRing for very large numbers of entries. Instead of a dict of keys
+to boxed int indices it keeps an open-addressing table of 32-bit ring indices, with each key stored
+once at its ring slot. Keys and values can be kept in fixed-width typed arrays instead of lists of objects.
+'''
+class CompactBalancedRing(BalancedRing):
+
+    __slots__ = ('table', 'mask', 'key_at')
+
+    def __init__(self, size, value_type=None, key_type=None):
+        """
+        Initializes the CompactBalancedRing object.
+        Args:
+            size (int): The size of the circular array.
+            value_type (str): An array typecode (e.g. 'q' or 'd') to store values as fixed-width
+                numbers instead of Python objects. None stores any object.
+            key_type (str): An array typecode to store keys as fixed-width numbers. None stores any
+                hashable object.
+        """
+        self.size = size  # The size of the circular array.
+        self.k = math.ceil(size / 2)  # Calculate k as the ceiling of size / 2.
+        self.pattern = [+self.k, +1, -self.k, +1]  # The traversal step pattern.
+        self.current = 0  # Start traversal at index 0.
+        self.i = 0  # Index to track the current step in the pattern.
+
+        self.array = _store(value_type, size)  # Initialize the buckets.
+        self.keys = None  # Keys are held by key_at and the table instead.
+        self.key_at = _store(key_type, size)  # The key stored at each ring slot.
+        self.occupied = bytearray(size)  # Occupancy bitmap of the buckets.
+        self.free = FreeIndex(period_length(size))  # The steps of the period visiting a free bucket.
+
+        # Linear probing table of ring slots, at most half full. -1 marks an empty entry.
+        capacity = 1 << max(2 * size - 1, 1).bit_length()
+        self.mask = capacity - 1
+        self.table = array('i', [-1]) * capacity
+
+    def insert(self, key, value):
+        """
+        Inserts a key-value pair into the next free bucket of the traversal and updates the table.
+        Args:
+            key: The key to insert.
+            value: The value associated with the key.
+        """
+        if self._find(key)[1] != -1:
+            raise KeyError("Key already exists in the ring.")
+
+        # Get the next free index for insertion
+        next = self._allocate()
+        try:
+            self.key_at[next] = key
+            self.array[next] = value
+        except (TypeError, OverflowError):
+            self._release(next)  # The typed stores rejected the key or value
+            raise
+        self.table[self._find(key)[0]] = next
+
+    def remove(self, key):
+        """
+        Removes a key from the ring and returns its bucket to the pool of free buckets.
+        Args:
+            key: The key to remove.
+        Returns:
+            The value that was associated with the key.
+        """
+        position, index = self._find(key)
+        if index == -1:
+            raise KeyError("Key not found in the ring.")
+
+        self._delete(position)
+        self._release(index)
+        value = self.array[index]
+        if isinstance(self.array, list):
+            self.array[index] = None  # Drop the references held by object stores
+        if isinstance(self.key_at, list):
+            self.key_at[index] = None
+        return value
+
+    def lookup(self, key):
+        """
+        Retrieves the value associated with a key in the ring.
+        Args:
+            key: The key to retrieve the value for.
+        Returns:
+            The value associated with the key.
+        """
+        index = self._find(key)[1]
+        if index == -1:
+            raise KeyError("Key not found in the ring.")
+        return self.array[index]
+
+    def __contains__(self, key):
+        return self._find(key)[1] != -1
+
+    def _find(self, key):
+        """
+        Probes the table for a key.
+        Returns:
+            tuple: The table position of the key, or of the empty entry ending the probe, and the
+            ring slot of the key, or -1 if it is not in the ring.
+        """
+        table, mask, key_at = self.table, self.mask, self.key_at
+        position = hash(key) & mask
+        while True:
+            index = table[position]
+            if index == -1:
+                return position, -1
+            stored = key_at[index]
+            if stored is key or stored == key:
+                return position, index
+            position = (position + 1) & mask
+
+    def _delete(self, position):
+        """
+        Empties a table position, shifting later entries of the probe back so no tombstone is needed.
+        """
+        table, mask, key_at = self.table, self.mask, self.key_at
+        hole = position
+        while True:
+            position = (position + 1) & mask
+            index = table[position]
+            if index == -1:
+                break
+            home = hash(key_at[index]) & mask
+            # The entry may fill the hole if the hole lies between its home and its position
+            if (position - home) & mask >= (position - hole) & mask:
+                table[hole] = index
+                hole = position
+        table[hole] = -1
+
+
+def _store(typecode, size):
+    """
+    Creates a store of size slots: a typed array for a typecode, otherwise a list of objects.
+    """
+    if typecode is None:
+        return [None] * size
+    return array(typecode, bytes(size * array(typecode).itemsize))
@@ -0,0 +1,87 @@
+from array import array
+
+'''
+The FreeIndex is the free-slot index of a BalancedRing: a set of positions, here the steps of the
+traversal period that visit a free bucket, kept as a hierarchy of 64-bit words. Each level has one bit
+per word of the level below, set while that word has any bit set. Finding the next set position walks
+up to the first level with a set bit to the right and back down, so allocation costs O(log64 n)
+instead of a scan of the period, and the index takes about one bit per position.
+'''
+class FreeIndex:
+
+    __slots__ = ('length', 'levels')
+
+    def __init__(self, length):
+        """
+        Initializes the FreeIndex object with every position set.
+        Args:
+            length (int): The number of positions.
+        """
+        self.length = length
+        self.levels = []  # The bit words of each level, from the positions up to a single word
+        count = length
+        while True:
+            words = array('Q', [(1 << 64) - 1]) * (count >> 6)
+            if count & 63:
+                words.append((1 << (count & 63)) - 1)
+            self.levels.append(words)
+            if len(words) <= 1:
+                break
+            count = len(words)
+
+    def add(self, position):
+        """
+        Sets a position, and the bits of the levels above whose word was empty.
+        """
+        for words in self.levels:
+            word = position >> 6
+            value = words[word]
+            words[word] = value | 1 << (position & 63)
+            if value:
+                return
+            position = word
+
+    def discard(self, position):
+        """
+        Clears a position, and the bits of the levels above whose word becomes empty.
+        """
+        for words in self.levels:
+            word = position >> 6
+            value = words[word] & ~(1 << (position & 63))
+            words[word] = value
+            if value:
+                return
+            position = word
+
+    def find(self, start=0):
+        """
+        Finds the first set position at or after start.
+        Args:
+            start (int): The position to search from.
+        Returns:
+            int: The position, or -1 if none is set.
+        """
+        levels = self.levels
+        position = start
+        depth = 0
+        # Climb until a word has a set bit at or after the position
+        while True:
+            words = levels[depth]
+            word = position >> 6
+            bits = words[word] >> (position & 63) if word < len(words) else 0
+            if bits:
+                position += (bits & -bits).bit_length() - 1
+                break
+            depth += 1
+            if depth == len(levels):
+                return -1
+            position = word + 1
+        # Descend to the lowest set bit under it
+        while depth:
+            depth -= 1
+            bits = levels[depth][position]
+            position = (position << 6) + (bits & -bits).bit_length() - 1
+        return position
+
+    def __contains__(self, position):
+        return bool(self.levels[0][position >> 6] >> (position & 63) & 1)
@@ -0,0 +1,273 @@
+import math
+
+from .routing import _jump, home_index, key_hash
+from .self_balancing import SelfBalancingRing
+from .traversal import offset
+
+'''
+The HierarchicalRing scales a SelfBalancingRing to thousands of nodes by splitting them into groups,
+such as racks or zones. An outer ring of groups picks each key's group from a stable hash of the key,
+and an inner SelfBalancingRing per group places the key on a node. Keys whose home group is full
+spill over along the (+k, +1, -k, +1) traversal of the outer ring and are recorded in an overflow
+table, as in a HashRing.
+
+Adding or removing a node only involves the inner ring of its group, so its cost depends on the size
+of that group rather than of the whole cluster. Nodes are identified by (group, node) pairs, and each
+inner ring numbers its own nodes.
+'''
+class HierarchicalRing:
+    def __init__(self, groups, upper_bound, lower_bound, variance_factor, probes=2):
+        """
+        Initializes the HierarchicalRing object.
+        Args:
+            groups (dict): Map of groups to their initial list of nodes, in outer ring order.
+            upper_bound (int): The upper limit of keys a node can have before triggering rebalancing.
+            lower_bound (int): The lower limit of keys a node can have before triggering rebalancing.
+            variance_factor (int): How many keys apart the loads of two nodes of a group may be.
+            probes (int): The number of groups of the outer traversal tried before the home group grows.
+        """
+        self.upper_bound = upper_bound
+        self.lower_bound = lower_bound
+        self.variance_factor = variance_factor
+        self.probes = probes
+
+        self.groups = list(groups)  # The outer ring
+        self.rings = {group: self._inner(nodes) for group, nodes in groups.items()}  # Map of groups to their inner ring
+        self.overflow = {}  # Map of the keys not in their home group to their group
+        self.hashes = {}  # Map of keys to their key_hash, computed once
+        self._homes = [{} for _ in self.groups]  # The keys whose home is each outer ring index
+        self._jumps = {}  # Map of group counts to the keys whose home moves when the outer ring grows to that count + 1
+        self._update_k()
+
+    def insert_key(self, key):
+        """
+        Inserts a key into its home group, or the first group of the outer traversal from there that
+        has room. If none of them has, the home group adds a node.
+        Args:
+            key: The key to insert.
+        """
+        if key in self:
+            raise ValueError("Key already exists in the ring.")
+        if not self.groups:
+            raise ValueError("The ring has no groups.")
+        self._place(key, key_hash(key))
+
+    def remove_key(self, key):
+        """
+        Removes a key from its group.
+        Args:
+            key: The key to remove.
+        """
+        group = self.group_of(key)
+        self.rings[group].remove_key(key)
+        self._forget(key)
+
+    def lookup(self, key):
+        """
+        Retrieves the group and node responsible for a key.
+        Args:
+            key: The key to retrieve the node for.
+        Returns:
+            tuple: The (group, node) pair.
+        """
+        group = self.group_of(key)
+        return group, self.rings[group].lookup(key)
+
+    def group_of(self, key):
+        """
+        Computes the group responsible for a key from its hash and the overflow table, without any
+        per-key state of the inner rings.
+        Args:
+            key: The key.
+        Returns:
+            The group of the key.
+        """
+        group = self.overflow.get(key)
+        if group is None:
+            if not self.groups:
+                raise KeyError("Key not found in the ring.")
+            group = self.groups[home_index(key_hash(key), len(self.groups))]
+        return group
+
+    def insert_node(self, group, node, weight=1):
+        """
+        Inserts a node into a group, rebalancing that group only.
+        Args:
+            group: The group of the node.
+            node (int): The node to insert.
+            weight (float): The capacity of the node relative to a node of weight 1.
+        Returns:
+            MigrationPlan: The migration applied within the group.
+        """
+        return self._ring(group).insert_node(node, weight=weight)
+
+    def remove_node(self, group, node):
+        """
+        Removes a node from a group, rebalancing that group only.
+        Args:
+            group: The group of the node.
+            node (int): The node to remove.
+        Returns:
+            MigrationPlan: The migration applied within the group.
+        """
+        return self._ring(group).remove_node(node)
+
+    def insert_group(self, group, nodes):
+        """
+        Appends a group to the outer ring. Only the keys whose home moves to the new group change
+        group, about 1 / (groups + 1) of them, found through their next jump without rehashing the
+        other keys.
+        Args:
+            group: The group to insert.
+            nodes (list): The initial nodes of the group.
+        Returns:
+            list: The (key, source group, destination group) moves.
+        """
+        if group in self.rings:
+            raise ValueError("Group already exists in the ring.")
+
+        self.groups.append(group)
+        self.rings[group] = self._inner(nodes)
+        self._homes.append({})
+        self._update_k()
+
+        n = len(self.groups)
+        leaving = {}  # Map of groups to their keys whose home becomes the new group
+        for key in self._jumps.pop(n - 1, {}):
+            h = self.hashes[key]
+            previous = _jump(h, n - 1)[0]
+            del self._homes[previous][key]
+            home, jump = _jump(h, n)
+            self._homes[home][key] = None
+            self._jumps.setdefault(jump, {})[key] = None
+            if key not in self.overflow:  # Spilled keys stay put
+                leaving.setdefault(self.groups[previous], []).append(key)
+
+        moves = []
+        for source, keys in leaving.items():
+            self.rings[source].remove_keys(keys)
+            moves.extend((key, source, group) for key in keys)
+        self.rings[group].insert_keys(key for key, _, _ in moves)
+        return moves
+
+    def remove_group(self, group):
+        """
+        Removes a group from the outer ring. The last group takes its place, so only the keys of
+        those two groups are placed again.
+        Args:
+            group: The group to remove.
+        Returns:
+            list: The (key, source group, destination group) moves.
+        """
+        removed = self._ring(group)
+        if len(self.groups) == 1 and removed.keys:
+            raise ValueError("Cannot remove the last group of a non-empty ring.")
+
+        orphans = [(key, group, self._forget(key)) for key in removed.keys]  # Keys to place again, with their source
+
+        # The last group takes the slot, and the keys homed there move home to a lower index
+        n = len(self.groups)
+        index, last = self.groups.index(group), self.groups[-1]
+        self.groups[index] = last
+        self.groups.pop()
+        del self.rings[group]
+        rehomed = self._homes.pop()
+        self._update_k()
+
+        if index < n - 1:
+            for key in self._homes[index]:
+                if self.overflow.get(key) == last:
+                    del self.overflow[key]  # Spilled onto the group that is now its home
+        displaced = []
+        for key in rehomed:
+            h = self.hashes[key]
+            previous = _jump(h, n)[1]
+            del self._jumps[previous][key]
+            if not self._jumps[previous]:
+                del self._jumps[previous]
+            home, jump = _jump(h, n - 1)
+            if key not in self.overflow and self.groups[home] != last:
+                displaced.append((key, self.hashes.pop(key)))  # Was in its home group, which now is another group
+                continue
+            self._homes[home][key] = None
+            self._jumps.setdefault(jump, {})[key] = None
+            if self.overflow.get(key) == self.groups[home]:
+                del self.overflow[key]
+        if displaced:
+            self.rings[last].remove_keys(key for key, _ in displaced)
+            orphans.extend((key, last, h) for key, h in displaced)
+
+        return [(key, source, self._place(key, h)) for key, source, h in orphans]
+
+    def _place(self, key, h):
+        """
+        Inserts a key into the first group of the outer traversal from its home group that has room,
+        or its home group, and records it in the overflow table if that is not its home.
+        Args:
+            key: The key to insert.
+            h (int): The key_hash of the key.
+        Returns:
+            The group of the key.
+        """
+        n = len(self.groups)
+        home, jump = _jump(h, n)
+        self.hashes[key] = h
+        self._homes[home][key] = None
+        self._jumps.setdefault(jump, {})[key] = None
+        group = self.groups[home]
+        for step in range(min(self.probes, n)):
+            candidate = self.groups[(home + offset(step, self.k)) % n]
+            if _room(self.rings[candidate]) > 0:
+                group = candidate
+                break
+        self.rings[group].insert_key(key)
+        if group != self.groups[home]:
+            self.overflow[key] = group
+        return group
+
+    def _forget(self, key):
+        """
+        Removes the hash, home, jump and overflow entries of a key.
+        Returns:
+            int: The key_hash of the key.
+        """
+        h = self.hashes.pop(key)
+        home, jump = _jump(h, len(self.groups))
+        del self._homes[home][key]
+        jumps = self._jumps[jump]
+        del jumps[key]
+        if not jumps:
+            del self._jumps[jump]
+        self.overflow.pop(key, None)
+        return h
+
+    def _ring(self, group):
+        if group not in self.rings:
+            raise ValueError("Group not found in the ring.")
+        return self.rings[group]
+
+    def _inner(self, nodes):
+        return SelfBalancingRing(list(nodes), self.upper_bound, self.lower_bound, self.variance_factor)
+
+    def _update_k(self):
+        """
+        Updates the value of k based on the current number of groups.
+        """
+        self.k = math.ceil(len(self.groups) / 2)
+
+    def __contains__(self, key):
+        try:
+            return key in self.rings[self.group_of(key)].keys
+        except KeyError:
+            return False
+
+    def __len__(self):
+        return sum(len(ring.keys) for ring in self.rings.values())
+
+def _room(ring):
+    """
+    Calculates how many more keys the nodes of a ring can hold under the upper bound.
+    """
+    if ring.weights:
+        return sum(ring._limit(node) for node in ring.ring) - len(ring.keys)
+    return len(ring.ring) * ring.upper_bound - len(ring.keys)
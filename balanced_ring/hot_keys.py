@@ -0,0 +1,214 @@
+import heapq
+import math
+import threading
+from operator import itemgetter
+
+from .instrumentation import unwrap_method, wrap_method
+from .snapshot import ConcurrentRing
+
+'''
+The HotKeyTracker balances a SelfBalancingRing by request load instead of key count. Once attached,
+every lookup adds to a decaying counter of its key and of its node. Old accesses fade with a half
+life counted in lookups: rather than halving every counter, the amount added per lookup doubles, and
+everything is rescaled now and then. Only the hottest keys are kept, so memory stays bounded by the
+capacity however many keys the ring holds.
+
+rebalance() remaps the hottest keys from the busiest nodes to the idlest, each swapped with a key the
+tracker has not seen on the receiving node, so key counts and the ring's bounds are not disturbed.
+A ring shared through a ConcurrentRing is attached through it, so that the moves are made under its
+writer lock and published to its readers. The counters have a lock of their own, since the readers
+of a ConcurrentRing look keys up from many threads.
+'''
+class HotKeyTracker:
+
+    # The increment at which all counters are scaled back down, well within float precision.
+    RESCALE_AT = 2.0 ** 40
+
+    def __init__(self, capacity=4096, half_life=100000, tolerance=0.1, max_moves=64, rebalance_every=None):
+        """
+        Initializes the HotKeyTracker object.
+        Args:
+            capacity (int): The number of key counters kept. Colder keys are forgotten beyond that.
+            half_life (int): The number of lookups after which an access counts half.
+            tolerance (float): The relative spread of node request loads that rebalance() accepts.
+            max_moves (int): The number of hot keys a rebalance remaps at most.
+            rebalance_every (int): Rebalance automatically after this many lookups, None to only rebalance on demand.
+        """
+        self.capacity = capacity
+        self.half_life = half_life
+        self.tolerance = tolerance
+        self.max_moves = max_moves
+        self.rebalance_every = rebalance_every
+
+        self.ring = None  # The attached SelfBalancingRing
+        self.shared = None  # The ConcurrentRing the ring was attached through, if any
+        self.counts = {}  # Map of the hottest keys to their scaled access counts
+        self.node_counts = {}  # Map of nodes to their scaled access counts
+        self.increment = 1.0  # The amount a lookup adds, doubled every half life
+        self.lookups = 0  # Lookups recorded since attaching
+        self._lock = threading.Lock()  # Guards the counters against concurrent lookups
+
+    def attach(self, ring):
+        """
+        Attaches the tracker to a ring, so that its lookups are counted.
+        Args:
+            ring (SelfBalancingRing or ConcurrentRing): The ring to track. A ring shared through a
+                ConcurrentRing must be attached through it, which counts the lookups of its snapshots.
+        """
+        if self.ring is not None:
+            self.detach()
+
+        def tracked(key):
+            node = tracked.__wrapped__(key)
+            self.record(key, node)
+            return node
+
+        wrap_method(ring, 'lookup', tracked, self)
+        if isinstance(ring, ConcurrentRing):
+            self.shared, ring = ring, ring.ring
+        self.ring = ring
+
+    def detach(self):
+        """
+        Detaches the tracker from its ring, keeping any other wrapper of its lookup, such as an
+        Instrumentation's.
+        """
+        unwrap_method(self.shared or self.ring, 'lookup', self)
+        self.ring = self.shared = None
+
+    def record(self, key, node):
+        """
+        Counts an access to a key on a node. Called by the attached ring's lookup, or directly for
+        lookups served elsewhere.
+        Args:
+            key: The key accessed.
+            node: The node holding the key.
+        """
+        with self._lock:
+            increment = self.increment
+            counts = self.counts
+            counts[key] = counts.get(key, 0.0) + increment
+            self.node_counts[node] = self.node_counts.get(node, 0.0) + increment
+            if len(counts) > self.capacity:
+                self._prune()
+
+            self.lookups += 1
+            if not self.lookups % self.half_life:
+                self.increment *= 2
+                if self.increment > self.RESCALE_AT:
+                    self._rescale()
+            due = self.rebalance_every and not self.lookups % self.rebalance_every
+        # Outside the lock: rebalancing takes the ConcurrentRing's writer lock first
+        if due and self.ring is not None:
+            self.rebalance()
+
+    def estimate(self, key):
+        """
+        Estimates the recent accesses to a key, with older accesses counting less.
+        Args:
+            key: The key.
+        Returns:
+            float: The decayed access count, 0 for keys that are not tracked.
+        """
+        with self._lock:
+            return self.counts.get(key, 0.0) / self.increment
+
+    def node_load(self, node):
+        """
+        Estimates the recent accesses to a node, like estimate.
+        """
+        with self._lock:
+            return self.node_counts.get(node, 0.0) / self.increment
+
+    def hottest(self, n):
+        """
+        Finds the most accessed keys.
+        Args:
+            n (int): The number of keys.
+        Returns:
+            list: The (key, decayed access count) pairs, hottest first.
+        """
+        with self._lock:
+            return [(key, count / self.increment) for key, count in heapq.nlargest(n, self.counts.items(), key=itemgetter(1))]
+
+    def rebalance(self):
+        """
+        Remaps hot keys from the node with the most requests per unit of weight to the node with the
+        fewest, until they are within tolerance of the average, max_moves keys moved or no busy node
+        has a key that fits. Each hot key is swapped with an untracked key of the receiving node, or
+        moved alone if that node has room. Through a ConcurrentRing, this all runs under its writer
+        lock and is published as one snapshot.
+        Returns:
+            list: The (key, source, destination) moves made.
+        """
+        if self.shared is not None:
+            return self.shared.run(self._rebalance)
+        return self._rebalance(self.ring)
+
+    def _rebalance(self, ring):
+        """
+        Makes the moves of rebalance on the ring itself.
+        """
+        with self._lock:
+            weights = ring.weights
+            self.node_counts = loads = {node: self.node_counts.get(node, 0.0) for node in ring.nodes}
+            if len(loads) < 2 or not any(loads.values()):
+                return []
+
+            def level(node):
+                return loads[node] / weights.get(node, 1)
+
+            average = sum(loads.values()) / sum(weights.get(node, 1) for node in loads)
+            hot = {}
+            for key, count in sorted(self.counts.items(), key=itemgetter(1), reverse=True):
+                if key in ring.keys and key not in ring.in_transit:
+                    hot.setdefault(ring.keys[key], []).append(key)
+
+            moves = []
+            stuck = set()  # Busy nodes none of whose hot keys can move
+            while len(moves) < self.max_moves and len(stuck) < len(loads):
+                source = max((node for node in loads if node not in stuck), key=level)
+                destination = min(loads, key=level)
+                gap = level(source) - level(destination)
+                if gap <= self.tolerance * average:
+                    break
+
+                # The hottest key whose move does not leave the destination busier than the source
+                limit = gap / (1 / weights.get(source, 1) + 1 / weights.get(destination, 1))
+                candidates = hot.get(source, [])
+                key = next((key for key in candidates if self.counts[key] <= limit), None)
+                cold = next((other for other in ring.nodes[destination]
+                             if other not in self.counts and other not in ring.in_transit), None)
+                full = len(ring.nodes[destination]) >= math.floor(ring.upper_bound * weights.get(destination, 1))
+                if key is None or (cold is None and full):
+                    stuck.add(source)
+                    continue
+
+                candidates.remove(key)
+                ring.remap(key, destination)
+                moves.append((key, source, destination))
+                if cold is not None:
+                    ring.remap(cold, source)
+                    moves.append((cold, destination, source))
+                loads[source] -= self.counts[key]
+                loads[destination] += self.counts[key]
+                hot.setdefault(destination, []).append(key)
+
+            if moves and ring.instrumentation is not None:
+                ring.instrumentation.keys_moved(moves)
+            return moves
+
+    def _prune(self):
+        """
+        Forgets the colder half of the key counters, with the counters locked.
+        """
+        self.counts = dict(heapq.nlargest(self.capacity // 2, self.counts.items(), key=itemgetter(1)))
+
+    def _rescale(self):
+        """
+        Scales all counters and the increment back down, keeping their ratios, with the counters locked.
+        """
+        scale = self.increment
+        self.counts = {key: count / scale for key, count in self.counts.items()}
+        self.node_counts = {node: count / scale for node, count in self.node_counts.items()}
+        self.increment = 1.0
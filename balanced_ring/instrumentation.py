@@ -0,0 +1,198 @@
+'''
+Instrumentation collects events and metrics from a SelfBalancingRing: callbacks for nodes joining
+and leaving, keys moving and traversal steps taken per insert, plus operation counters and timing
+histograms. A ring without instrumentation attached runs its plain methods, so disabled
+instrumentation costs nothing; attaching it wraps the ring's public operations with timers.
+'''
+from time import perf_counter
+
+class Histogram:
+
+    def __init__(self):
+        """
+        Initializes the Histogram object, with power-of-two nanosecond buckets.
+        """
+        self.buckets = [0] * 64  # buckets[b] counts durations in [2^(b-1), 2^b) nanoseconds.
+        self.count = 0
+        self.total = 0.0  # Sum of all durations, in seconds.
+
+    def record(self, seconds):
+        """
+        Records a duration.
+        Args:
+            seconds (float): The duration to record.
+        """
+        self.buckets[min(int(seconds * 1e9).bit_length(), 63)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q):
+        """
+        Estimates a percentile from the buckets.
+        Args:
+            q (float): The percentile, between 0 and 100.
+        Returns:
+            float: The upper edge in seconds of the bucket holding the percentile, or 0.0 if empty.
+        """
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return (1 << bucket) / 1e9
+        return 0.0
+
+class Instrumentation:
+
+    # Ring methods that are timed, and the operation they are recorded under.
+    OPERATIONS = {
+        'insert_key': 'insert',
+        'insert_keys': 'insert',
+        'remove_key': 'remove',
+        'remove_keys': 'remove',
+        'lookup': 'lookup',
+        'apply_migration': 'rebalance',
+    }
+
+    def __init__(self, on_node_join=None, on_node_leave=None, on_keys_moved=None, on_insert_steps=None):
+        """
+        Initializes the Instrumentation object.
+        Args:
+            on_node_join (callable): Called with each node that joins the ring.
+            on_node_leave (callable): Called with each node that leaves the ring.
+            on_keys_moved (callable): Called with the list of (key, source, destination) moves of a rebalance.
+            on_insert_steps (callable): Called with the key, its node and the traversal steps taken by insert_key.
+        """
+        self.on_node_join = on_node_join
+        self.on_node_leave = on_node_leave
+        self.on_keys_moved = on_keys_moved
+        self.on_insert_steps = on_insert_steps
+
+        self.counters = {}  # Map of counter names to counts.
+        self.timings = {}  # Map of operations to Histograms.
+
+    def attach(self, ring):
+        """
+        Attaches the instrumentation to a ring, replacing any attached before.
+        Args:
+            ring (SelfBalancingRing): The ring to instrument.
+        """
+        if ring.instrumentation is not None:
+            ring.instrumentation.detach(ring)
+
+        ring.instrumentation = self
+        for name, operation in self.OPERATIONS.items():
+            wrapper = self._insert_wrapper if name == 'insert_key' else self._wrapper
+            wrap_method(ring, name, wrapper(ring, operation), self)
+
+    def detach(self, ring):
+        """
+        Detaches the instrumentation from a ring, keeping any other wrapper of its methods, such
+        as a HotKeyTracker's.
+        Args:
+            ring (SelfBalancingRing): The instrumented ring.
+        """
+        for name in self.OPERATIONS:
+            unwrap_method(ring, name, self)
+        ring.instrumentation = None
+
+    def count(self, name, amount=1):
+        """
+        Increments a counter.
+        Args:
+            name (str): The counter to increment.
+            amount (int): The amount to add.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def time(self, operation, seconds):
+        """
+        Records the duration of an operation and counts it.
+        Args:
+            operation (str): The operation, e.g. 'insert' or 'rebalance'.
+            seconds (float): The duration to record.
+        """
+        if operation not in self.timings:
+            self.timings[operation] = Histogram()
+        self.timings[operation].record(seconds)
+        self.count(operation)
+
+    def node_joined(self, node):
+        self.count('nodes_joined')
+        if self.on_node_join is not None:
+            self.on_node_join(node)
+
+    def node_left(self, node):
+        self.count('nodes_left')
+        if self.on_node_leave is not None:
+            self.on_node_leave(node)
+
+    def keys_moved(self, moves):
+        self.count('keys_moved', len(moves))
+        if self.on_keys_moved is not None:
+            self.on_keys_moved(moves)
+
+    def _wrapper(self, ring, operation):
+        """
+        Wraps a ring method so that its duration is recorded under an operation.
+        """
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return timed.__wrapped__(*args, **kwargs)
+            finally:
+                self.time(operation, perf_counter() - start)
+        return timed
+
+    def _insert_wrapper(self, ring, operation):
+        """
+        Wraps insert_key to also report the traversal steps it took.
+        """
+        def timed(key):
+            start, steps = perf_counter(), ring.i
+            try:
+                return timed.__wrapped__(key)
+            finally:
+                self.time(operation, perf_counter() - start)
+                steps = ring.i - steps
+                self.count('insert_steps', steps)
+                if self.on_insert_steps is not None and key in ring.keys:
+                    self.on_insert_steps(key, ring.keys[key], steps)
+        return timed
+
+def wrap_method(target, name, wrapper, owner):
+    """
+    Installs a wrapper of a method on an object, around any wrapper installed before. The wrapper
+    must call the method it wraps through its own __wrapped__ attribute, set here, so that
+    unwrap_method can later take it out of the chain in any order.
+    Args:
+        target: The object whose method is wrapped, e.g. a SelfBalancingRing.
+        name (str): The name of the method.
+        wrapper (function): The wrapper.
+        owner: The object installing the wrapper, to find it by in unwrap_method.
+    """
+    wrapper.__wrapped__ = getattr(target, name)
+    wrapper.owner = owner
+    setattr(target, name, wrapper)
+
+def unwrap_method(target, name, owner):
+    """
+    Removes the wrapper an owner installed with wrap_method, keeping the other wrappers of the
+    method. Once no wrapper is left, the plain method is restored.
+    Args:
+        target: The object whose method is wrapped.
+        name (str): The name of the method.
+        owner: The object that installed the wrapper.
+    """
+    outer, wrapper = None, target.__dict__.get(name)
+    while wrapper is not None and getattr(wrapper, 'owner', None) is not owner:
+        outer, wrapper = wrapper, getattr(wrapper, '__wrapped__', None)
+    if wrapper is None:
+        return
+    inner = wrapper.__wrapped__
+    if outer is not None:
+        outer.__wrapped__ = inner
+    elif hasattr(inner, 'owner'):
+        setattr(target, name, inner)
+    else:
+        del target.__dict__[name]  # Back to the plain method
@@ -0,0 +1,99 @@
+'''
+The LoadIndex keeps the nodes of a SelfBalancingRing bucketed by their number of keys, so that the
+least loaded node can be found in O(1) instead of scanning the ring. Loads change by small steps as
+keys are inserted, removed and remapped, which keeps the minimum cheap to maintain incrementally.
+Nodes with a weight other than 1 are bucketed by their load divided by their weight.
+'''
+class LoadIndex:
+
+    def __init__(self, nodes=(), weights=None):
+        """
+        Initializes the LoadIndex object.
+        Args:
+            nodes (iterable): Initial nodes, all with a load of 0.
+            weights (dict): Map of nodes to their capacity weight, 1 if missing.
+        """
+        self.loads = {}  # Map of nodes to their load.
+        self.weights = {}  # Map of nodes to their weight, for weights other than 1.
+        self.buckets = {}  # Map of weighted loads to the nodes with that load, as insertion-ordered dicts.
+        self.minimum = 0  # The smallest weighted load of any node.
+
+        weights = weights or {}
+        for node in nodes:
+            self.add(node, weight=weights.get(node, 1))
+
+    def add(self, node, load=0, weight=1):
+        """
+        Adds a node to the index.
+        Args:
+            node: The node to add.
+            load (int): The number of keys the node holds.
+            weight (float): The capacity of the node relative to a node of weight 1.
+        """
+        if node in self.loads:
+            raise ValueError("Node already exists in the index.")
+
+        if weight != 1:
+            self.weights[node] = weight
+        level = self._level(node, load)
+        if not self.loads or level < self.minimum:
+            self.minimum = level
+        self.loads[node] = load
+        self.buckets.setdefault(level, {})[node] = None
+
+    def remove(self, node):
+        """
+        Removes a node from the index.
+        Args:
+            node: The node to remove.
+        """
+        if node not in self.loads:
+            raise ValueError("Node not found in the index.")
+
+        self._unbucket(node, self._level(node, self.loads.pop(node)))
+        self.weights.pop(node, None)
+
+    def adjust(self, node, delta):
+        """
+        Changes the load of a node.
+        Args:
+            node: The node whose load changed.
+            delta (int): The number of keys added (positive) or removed (negative).
+        """
+        if not delta:
+            return
+
+        load = self.loads[node]
+        self.loads[node] = load + delta
+        level = self._level(node, load + delta)
+        self.buckets.setdefault(level, {})[node] = None
+        self._unbucket(node, self._level(node, load))  # After bucketing the new load, so the minimum accounts for it
+        if level < self.minimum:
+            self.minimum = level
+
+    def least_loaded(self):
+        """
+        Finds a node with the smallest load, relative to its weight.
+        Returns:
+            The least loaded node, or None if the index is empty.
+        """
+        if not self.loads:
+            return None
+        return next(iter(self.buckets[self.minimum]))
+
+    def _level(self, node, load):
+        """
+        Calculates the bucket of a load: the load divided by the node's weight.
+        """
+        return load / self.weights[node] if node in self.weights else load
+
+    def _unbucket(self, node, level):
+        """
+        Removes a node from the bucket of its weighted load and moves the minimum up if that bucket empties.
+        """
+        bucket = self.buckets[level]
+        del bucket[node]
+        if not bucket:
+            del self.buckets[level]
+            if level == self.minimum:
+                self.minimum = min(self.buckets) if self.buckets else 0
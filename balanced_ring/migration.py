@@ -0,0 +1,30 @@
+'''
+A MigrationPlan describes a topology change of a SelfBalancingRing: the nodes that join, the nodes
+that leave, and the keys that have to move between nodes for the ring to stay balanced. Plans are
+computed without touching the ring, so the cost of a change can be measured before applying it.
+'''
+class MigrationPlan:
+
+    def __init__(self, add, remove, moves, weights=None):
+        """
+        Initializes the MigrationPlan object.
+        Args:
+            add (list): Nodes joining the ring.
+            remove (list): Nodes leaving the ring.
+            moves (list): The (key, source node, destination node) moves, in order.
+            weights (dict): New capacity weights of joining or existing nodes.
+        """
+        self.add = add
+        self.remove = remove
+        self.moves = moves
+        self.weights = weights or {}
+
+    @property
+    def cost(self):
+        """
+        int: The number of keys the plan moves.
+        """
+        return len(self.moves)
+
+    def __repr__(self):
+        return f"MigrationPlan(add={self.add}, remove={self.remove}, moves={self.cost})"
@@ -0,0 +1,242 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import OrderedDict
+
+from .load_index import LoadIndex
+from .self_balancing import SelfBalancingRing
+
+'''
+Binary snapshots of a SelfBalancingRing, to restart without replaying every insert_key.
+
+A snapshot holds the bounds, the traversal state (current and i), the nodes in ring order with their
+weights and the key to node map as fixed-width arrays: keys are grouped by node in the order their
+node holds them, each with the index of its node, an offset into a table of UTF-8 key strings and a
+slot in an open-addressing hash table. MappedRing maps the file with mmap and resolves lookups directly from
+the mapped arrays, so opening a snapshot costs the same for any number of keys and pages are only
+read from disk when a lookup touches them.
+
+Layout (little-endian, sections aligned to 8 bytes):
+    header       magic, format version, offset width, counts, traversal state, bounds and replication
+    nodes        int64[nodes]       the nodes in ring order
+    weights      float64[nodes]     the capacity weight of each node
+    key_nodes    uint32[keys]       the index in nodes of each key's node
+    offsets      uint32[keys + 1]   start of each key in strings (uint64 if strings exceed 4 GiB)
+    table        uint32[slots]      1 + the index of a key, at crc32(key) with linear probing, 0 if empty
+    strings      bytes              the UTF-8 encoded keys
+'''
+
+MAGIC = b'BRSR'
+
+# Version of the layout, incremented on incompatible changes.
+FORMAT_VERSION = 3
+
+# magic, version, offset itemsize, node count, key count, table slots, strings size,
+# current, i, upper_bound, lower_bound, variance_factor, replication
+_HEADER = struct.Struct('<4sHHQQQQqqqqqq')
+
+
+def save_snapshot(ring, path):
+    """
+    Writes a snapshot of a SelfBalancingRing. The file is replaced atomically, so a crash
+    leaves either the previous snapshot or the new one.
+    Args:
+        ring (SelfBalancingRing): The ring to save. Its keys must be str and its nodes int.
+        path (str): The file to write.
+    """
+    _check_byteorder()
+    index = {node: position for position, node in enumerate(ring.ring)}
+    key_nodes = array('I')
+    offsets = array('Q', [0])
+    strings = bytearray()
+    encoded = []
+    for node in ring.ring:
+        for key in ring.nodes[node]:
+            if not isinstance(key, str):
+                raise TypeError("Snapshots only support str keys.")
+            data = key.encode()
+            encoded.append(data)
+            strings += data
+            offsets.append(len(strings))
+        key_nodes.extend([index[node]] * len(ring.nodes[node]))
+    if len(strings) < 1 << 32:
+        offsets = array('I', offsets)
+
+    # Linear probing table, at most half full
+    slots = 1 << max(2 * len(encoded) - 1, 1).bit_length()
+    mask = slots - 1
+    table = array('I', bytes(4 * slots))
+    for position, data in enumerate(encoded, 1):
+        slot = zlib.crc32(data) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = position
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, offsets.itemsize, len(ring.ring), len(encoded), slots,
+                          len(strings), ring.current, ring.i, ring.upper_bound, ring.lower_bound,
+                          ring.variance_factor, ring.replication)
+    temporary = f'{path}.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            weights = array('d', (ring.weights.get(node, 1) for node in ring.ring))
+            for section in (header, array('q', ring.ring), weights, key_nodes, offsets, table, strings):
+                file.write(section)
+                file.write(bytes(-file.tell() % 8))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)  # Leave no partial snapshot behind
+        except OSError:
+            pass
+        raise
+
+
+def load_snapshot(path):
+    """
+    Opens a snapshot for lookups, see MappedRing.
+    Args:
+        path (str): The snapshot file.
+    Returns:
+        MappedRing: The mapped snapshot.
+    """
+    return MappedRing(path)
+
+
+class MappedRing:
+
+    __slots__ = ('_map', '_views', 'nodes', 'weights', 'key_nodes', 'offsets', 'table', 'strings', 'mask',
+                 'current', 'i', 'upper_bound', 'lower_bound', 'variance_factor', 'replication')
+
+    def __init__(self, path):
+        """
+        Initializes the MappedRing object, mapping a snapshot read-only. Nothing but the header is read.
+        Args:
+            path (str): The snapshot file, see save_snapshot.
+        """
+        _check_byteorder()
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, width, node_count, key_count, slots, size, self.current, self.i,
+             self.upper_bound, self.lower_bound, self.variance_factor, self.replication) = _HEADER.unpack_from(self._map)
+        except struct.error:
+            self._map.close()
+            raise ValueError("Not a ring snapshot.") from None
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError("Not a ring snapshot, or an unsupported version.")
+
+        view = memoryview(self._map)
+        self._views = [view]
+        position = _HEADER.size
+
+        def section(typecode, count, itemsize):
+            nonlocal position
+            start = position
+            position += -(-count * itemsize // 8) * 8
+            part = view[start:start + count * itemsize]
+            self._views.append(part)
+            if typecode == 'B':
+                return part
+            part = part.cast(typecode)
+            self._views.append(part)
+            return part
+
+        position += -position % 8
+        self.nodes = section('q', node_count, 8)
+        self.weights = section('d', node_count, 8)
+        self.key_nodes = section('I', key_count, 4)
+        self.offsets = section('I' if width == 4 else 'Q', key_count + 1, width)
+        self.table = section('I', slots, 4)
+        self.strings = section('B', size, 1)
+        self.mask = slots - 1
+
+    def lookup(self, key):
+        """
+        Retrieves the node responsible for a key from the mapped arrays.
+        Args:
+            key (str): The key to retrieve the node for.
+        Returns:
+            int: The node responsible for the key.
+        """
+        index = self._find(key)
+        if index < 0:
+            raise KeyError("Key not found in the ring.")
+        return self.nodes[self.key_nodes[index]]
+
+    def restore(self):
+        """
+        Rebuilds a SelfBalancingRing from the snapshot, with the same nodes, key order per node
+        and traversal state, so later inserts continue exactly where the saved ring stopped.
+        Returns:
+            SelfBalancingRing: The restored ring.
+        """
+        ring = SelfBalancingRing(list(self.nodes), self.upper_bound, self.lower_bound, self.variance_factor,
+                                 dict(zip(self.nodes, self.weights)), self.replication)
+        keys = iter(self)
+        start = 0
+        for position, node in enumerate(ring.ring):
+            stop = start
+            while stop < len(self.key_nodes) and self.key_nodes[stop] == position:
+                stop += 1
+            ring.nodes[node] = OrderedDict.fromkeys(next(keys) for _ in range(stop - start))
+            start = stop
+        ring.keys = {key: node for node, held in ring.nodes.items() for key in held}
+        ring.load_index = LoadIndex()
+        for node in ring.ring:
+            ring.load_index.add(node, len(ring.nodes[node]), ring.weights.get(node, 1))
+        ring.current, ring.i = self.current, self.i
+        return ring
+
+    def close(self):
+        """
+        Unmaps the snapshot. Lookups fail afterwards.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def _find(self, key):
+        """
+        Probes the hash table for a key.
+        Returns:
+            int: The index of the key, or -1 if it is not in the snapshot.
+        """
+        data = key.encode()
+        table, offsets, strings, mask = self.table, self.offsets, self.strings, self.mask
+        slot = zlib.crc32(data) & mask
+        while True:
+            entry = table[slot]
+            if not entry:
+                return -1
+            if strings[offsets[entry - 1]:offsets[entry]] == data:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __len__(self):
+        return len(self.key_nodes)
+
+    def __iter__(self):
+        offsets, strings = self.offsets, self.strings
+        for index in range(len(self.key_nodes)):
+            yield bytes(strings[offsets[index]:offsets[index + 1]]).decode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _check_byteorder():
+    if sys.byteorder != 'little':
+        raise ValueError("Snapshots are little-endian and cannot be read or written on this big-endian machine.")
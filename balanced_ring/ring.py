@@ -0,0 +1,249 @@
+import copy
+import math
+
+from .free_index import FreeIndex
+from .traversal import displacement, occurrences, offset, period_length, positions
+
+'''
+The BalancedRing implements a circular array with a symmetric traversal pattern, facilitating evenly 
+distributed lookup or storage of elements. The class supports key-value insertion, removal, and retrieval, 
+ensuring that the ring remains balanced. The traversal follows a +k, +1, -k, +1 pattern, providing efficient 
+distribution across the array. This structure is ideal for applications requiring balanced data 
+distribution and efficient traversal.
+'''
+class BalancedRing:
+
+    __slots__ = ('size', 'k', 'pattern', 'array', 'keys', 'occupied', 'free', 'current', 'i')
+
+    def __init__(self, size):
+        """
+        Initializes the BalancedRing object.
+        Args:
+            size (int): The size of the circular array.
+        """
+        self.size = size  # The size of the circular array.
+        self.k = math.ceil(size / 2)  # Calculate k as the ceiling of size / 2.
+        self.pattern = [+self.k, +1, -self.k, +1]  # The traversal step pattern.
+        
+        self.array = [None] * size  # Initialize the buckets.
+        self.keys = {}  # Initialize the map of keys to buckets.
+        self.occupied = bytearray(size)  # Occupancy bitmap of the buckets.
+        self.free = FreeIndex(period_length(size))  # The steps of the period visiting a free bucket.
+        self.current = 0  # Start traversal at index 0.
+        self.i = 0  # Index to track the current step in the pattern.
+
+    def insert(self, key, value):
+        """
+        Inserts a key-value pair into the next free bucket of the traversal and updates the map.
+        Args:
+            key: The key to insert.
+            value: The value associated with the key.
+        """
+        if key in self.keys:
+            raise KeyError("Key already exists in the ring.")
+
+        # Get the next free index for insertion
+        next = self._allocate()
+
+        # Insert the key-value pair into the ring and update the map
+        self.array[next] = value
+        self.keys[key] = next
+
+    def remove(self, key):
+        """
+        Removes a key from the ring and returns its bucket to the pool of free buckets.
+        Args:
+            key: The key to remove.
+        Returns:
+            The value that was associated with the key.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+
+        index = self.keys.pop(key)
+        value = self.array[index]
+        self.array[index] = None
+        self._release(index)
+        return value
+
+    def lookup(self, key):
+        """
+        Retrieves the value associated with a key in the ring.
+        Args:
+            key: The key to retrieve the value for.
+        Returns:
+            The value associated with the key.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+
+        # Get the index of the key and return the associated value
+        index = self.keys[key]
+        return self.array[index]
+
+    def next(self):
+        """
+        Calculates the next index based on the balanced traversal rule.
+        Returns:
+            int: The next index.
+        """
+        step = self.pattern[self.i % 4]  # Determine the step based on the pattern.
+        # Calculate the next index and update current
+        next = (self.current + step) % self.size
+        self.current = next
+
+        self.i += 1  # Increment the step index.
+        return next  # Return the new current index.
+
+    def previous(self):
+        """
+        Calculates the previous index based on the balanced traversal rule.
+        Returns:
+            int: The previous index.
+        """
+        self.i -= 1  # Decrement the step index.
+        step = self.pattern[(self.i) % 4]  # Determine the reverse step.
+        # Calculate the previous index and update current
+        prev = (self.current - step) % self.size
+        self.current = prev
+
+        return prev  # Return the new current index.
+
+    def position_at(self, i):
+        """
+        Calculates the index reached after i steps of the traversal without walking it.
+        Args:
+            i (int): The step count, as held by self.i.
+        Returns:
+            int: The index self.current holds after i calls to next() from a fresh ring.
+        """
+        return offset(i, self.k) % self.size
+
+    def seek(self, i):
+        """
+        Moves the traversal directly to step i in O(1).
+        Args:
+            i (int): The step count to move to.
+        Returns:
+            int: The new current index.
+        """
+        self.current = self.position_at(i)
+        self.i = i
+        return self.current
+
+    def seek_back(self, m):
+        """
+        Moves the traversal back m steps in O(1), equivalent to calling previous() m times.
+        Args:
+            m (int): The number of steps to move back.
+        Returns:
+            int: The new current index.
+        """
+        self.current = (self.current - displacement(self.i - m, self.i, self.k)) % self.size
+        self.i -= m
+        return self.current
+
+    def traverse(self, length, vectorized=False):
+        """
+        Generates a traversal sequence based on the balanced traversal rule.
+        Args:
+            length (int): The length of the traversal sequence to generate.
+            vectorized (bool): Tile the cached traversal period into a NumPy array instead of stepping.
+        Returns:
+            list: The traversal sequence, or a numpy.ndarray when vectorized.
+        """
+        if vectorized:
+            sequence = positions(self.size, self.i, max(length, 1))
+            self.seek(self.i + len(sequence) - 1)  # Leave the traversal where the loop would have.
+            return sequence
+
+        sequence = [self.current]  # Start the sequence with the current index.
+
+        for i in range(1, length):
+            self.current = self.next()  # Calculate the next index.
+            sequence.append(self.current)  # Append the index to the sequence.
+
+        return sequence  # Return the generated sequence.
+
+    def iter_forward(self, start_step=None):
+        """
+        Lazily yields the traversal from a step onwards, without changing current or i.
+        Args:
+            start_step (int): The step to start at. Defaults to the ring's current step.
+        Yields:
+            int: The index at the start step, then the index after each further next().
+        """
+        cursor = self._cursor(start_step)
+        yield cursor.current
+        while True:
+            yield cursor.next()
+
+    def iter_backward(self, start_step=None):
+        """
+        Lazily yields the traversal backwards from a step, without changing current or i.
+        Args:
+            start_step (int): The step to start at. Defaults to the ring's current step.
+        Yields:
+            int: The index at the start step, then the index after each further previous().
+        """
+        cursor = self._cursor(start_step)
+        yield cursor.current
+        while True:
+            yield cursor.previous()
+
+    def iter_chunks(self, chunk_size, start_step=None, length=None):
+        """
+        Lazily yields the traversal as NumPy arrays tiled from the cached period.
+        Args:
+            chunk_size (int): The number of indices per chunk.
+            start_step (int): The step to start at. Defaults to the ring's current step.
+            length (int): The total number of indices to yield. Unbounded if None.
+        Yields:
+            numpy.ndarray: Consecutive chunks of the traversal, the last one possibly shorter.
+        """
+        step = self.i if start_step is None else start_step
+        remaining = length
+        while remaining is None or remaining > 0:
+            count = chunk_size if remaining is None else min(chunk_size, remaining)
+            yield positions(self.size, step, count)
+            step += count
+            if remaining is not None:
+                remaining -= count
+
+    def _allocate(self):
+        """
+        Advances the traversal to the next step visiting a free bucket and marks the bucket occupied.
+        The free-slot index finds that step in O(log n), however many occupied steps lie before it.
+        Returns:
+            int: The allocated index.
+        """
+        length = self.free.length
+        start = (self.i + 1) % length
+        position = self.free.find(start)
+        if position == -1:
+            position = self.free.find()  # Wrap around the period
+            if position == -1:
+                raise ValueError("The ring is full.")
+
+        index = self.seek(self.i + 1 + (position - start) % length)
+        self.occupied[index] = 1
+        for step in occurrences(self.size, index):
+            self.free.discard(step)
+        return index
+
+    def _release(self, index):
+        """
+        Marks a bucket free again.
+        """
+        self.occupied[index] = 0
+        for step in occurrences(self.size, index):
+            self.free.add(step)
+
+    def _cursor(self, start_step):
+        """
+        Creates an independent copy of the traversal state positioned at a step.
+        """
+        cursor = copy.copy(self)
+        if start_step is not None:
+            cursor.seek(start_step)
+        return cursor
@@ -0,0 +1,356 @@
+import hashlib
+import math
+
+from .load_index import LoadIndex
+from .migration import MigrationPlan
+from .traversal import offset
+
+'''
+Stateless routing: a key's node is computed from a stable hash of the key instead of being looked
+up in a key to node map. The hash picks a home index in the ring with jump consistent hashing, so
+adding a node at the end of the ring only moves the keys that the new node takes over. Keys whose
+home node is full spill over along the (+k, +1, -k, +1) traversal starting at the home index, so the
+first alternative is always the +k partner, and are recorded in a small overflow table.
+
+A HashRing is the authority: it holds every key and enforces the bounded loads. Routers only need
+its RingDescriptor, the node list and the overflow table, which is O(nodes) memory when the load
+factor leaves some headroom. It is a separate class rather than a mode of SelfBalancingRing, whose
+placement follows its own traversal cursor: it bounds loads with the load factor and upper bound
+only, and has no lower bound or variance factor.
+'''
+
+# Multiplier of the linear congruential generator used by jump consistent hashing.
+_JUMP_MULTIPLIER = 2862933555777941757
+
+_MASK64 = (1 << 64) - 1
+
+
+def key_hash(key):
+    """
+    Calculates a 64-bit hash of a key that is the same in every process, unlike hash().
+    Args:
+        key: A bytes, str or other key, the latter hashed through str(key).
+    Returns:
+        int: The hash.
+    """
+    if not isinstance(key, bytes):
+        key = str(key).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+def home_index(h, n):
+    """
+    Maps a hash to an index of a ring of n nodes with jump consistent hashing. Growing the ring
+    from n to n + 1 nodes changes the index of only 1 / (n + 1) of the hashes, all to n.
+    Args:
+        h (int): A 64-bit hash, see key_hash.
+        n (int): The number of nodes.
+    Returns:
+        int: The index, in range(n).
+    """
+    return _jump(h, n)[0]
+
+
+def _jump(h, n):
+    """
+    Maps a hash to its home index in a ring of n nodes, like home_index, along with the ring size
+    at which that index next changes: the key moves to index j when the ring grows to j + 1 nodes.
+    Returns:
+        tuple: The (home index, next jump) pair.
+    """
+    index, j = -1, 0
+    while j < n:
+        index = j
+        h = (h * _JUMP_MULTIPLIER + 1) & _MASK64
+        j = int((index + 1) * ((1 << 31) / ((h >> 33) + 1)))
+    return index, j
+
+
+class RingDescriptor:
+
+    __slots__ = ('nodes', 'overflow', 'version')
+
+    def __init__(self, nodes, overflow=None, version=0):
+        """
+        Initializes the RingDescriptor object, the state a client needs to route keys.
+        Args:
+            nodes (tuple): The nodes of the ring, in ring order.
+            overflow (dict): Map of the keys not on their home node to their node.
+            version (int): The version of the HashRing the descriptor was taken from.
+        """
+        self.nodes = tuple(nodes)
+        self.overflow = overflow or {}
+        self.version = version
+
+    def lookup(self, key):
+        """
+        Computes the node responsible for a key. Keys that are not in the ring get the node
+        they would be inserted into if their home node had room.
+        Args:
+            key: The key to route.
+        Returns:
+            The node responsible for the key.
+        """
+        node = self.overflow.get(key)
+        if node is not None:
+            return node
+        if not self.nodes:
+            raise KeyError("The ring has no nodes.")
+        return self.nodes[home_index(key_hash(key), len(self.nodes))]
+
+class HashRing:
+    def __init__(self, initial_nodes, upper_bound, load_factor=1.25, probes=4):
+        """
+        Initializes the HashRing object.
+        Args:
+            initial_nodes (list): Initial list of nodes.
+            upper_bound (int): The upper limit of keys a node can have before a node is added.
+            load_factor (float): How far above the average load a home node may fill before keys spill over.
+            probes (int): The number of traversal steps tried before falling back to the least loaded node.
+        """
+        self.ring = list(initial_nodes or [])
+        self.upper_bound = upper_bound
+        self.load_factor = load_factor
+        self.probes = probes
+
+        self.keys = {}  # Map of keys to nodes, only needed by the authority
+        self.nodes = {node: {} for node in self.ring}  # Map of nodes to their keys, as insertion-ordered dicts
+        self.hashes = {}  # Map of keys to their key_hash, computed once
+        self.overflow = {}  # Map of the keys not on their home node to their node
+        self.load_index = LoadIndex(self.ring)  # Nodes bucketed by number of keys
+        self.version = 0  # Incremented whenever the descriptor changes
+        self._homes = [{} for _ in self.ring]  # The keys whose home is each ring index
+        self._jumps = {}  # Map of ring sizes to the keys whose home moves when the ring grows to that size + 1
+        self._update_k()
+
+    def descriptor(self):
+        """
+        Takes the routing state that clients need, independent of later changes to the ring.
+        Returns:
+            RingDescriptor: The nodes and overflow table of the ring.
+        """
+        return RingDescriptor(self.ring, dict(self.overflow), self.version)
+
+    def insert_key(self, key):
+        """
+        Inserts a key on its home node, or on the first node of the traversal from there that is
+        under the load limit. A node is added if all nodes are at the upper bound.
+        Args:
+            key: The key to insert.
+        """
+        if key in self.keys:
+            raise ValueError("Key already exists in the ring.")
+
+        h = key_hash(key)
+        node = self._choose(h, self._capacity(len(self.keys) + 1))
+        if node is None:
+            self.insert_node(max(self.ring) + 1 if self.ring else 0)
+            node = self._choose(h, self._capacity(len(self.keys) + 1))
+        self._assign(key, node, h)
+
+    def remove_key(self, key):
+        """
+        Removes a key from the ring.
+        Args:
+            key: The key to remove.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+        self._detach(key)
+        del self.hashes[key]
+
+    def lookup(self, key):
+        """
+        Retrieves the node responsible for a key.
+        Args:
+            key: The key to retrieve the node for.
+        Returns:
+            The node responsible for the key.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+        return self.keys[key]
+
+    def insert_node(self, node):
+        """
+        Appends a node to the ring. Only the keys whose home moves to the new node change node,
+        found through their next jump without rehashing the other keys.
+        Args:
+            node: The node to insert.
+        Returns:
+            MigrationPlan: The applied migration.
+        """
+        if node in self.nodes:
+            raise ValueError("Node already exists in the ring.")
+
+        plan = MigrationPlan([node], [], [])
+        self._append(node, plan)
+        return plan
+
+    def remove_node(self, node):
+        """
+        Removes a node from the ring. The last node takes its place in the ring order, so only the
+        keys of those two nodes move and the others stay.
+        Args:
+            node: The node to remove.
+        Returns:
+            MigrationPlan: The applied migration.
+        """
+        if node not in self.nodes:
+            raise ValueError("Node not found in the ring.")
+
+        plan = MigrationPlan([], [node], [])
+        pending = [(key, node) for key in self.nodes[node]]  # Keys to place again, with their source
+        for key, _ in pending:
+            self._detach(key)
+
+        # The last node takes the slot, and the keys homed there move home to a lower index
+        n = len(self.ring)
+        index, last = self.ring.index(node), self.ring[-1]
+        self.ring[index] = last
+        self.ring.pop()
+        del self.nodes[node]
+        self.load_index.remove(node)
+        rehomed = self._homes.pop()
+        self._update_k()
+        self.version += 1
+
+        if index < n - 1:
+            for key in self._homes[index]:
+                if self.keys[key] == last:
+                    del self.overflow[key]  # Spilled onto the node that is now its home
+        displaced = []
+        for key in rehomed:
+            h = self.hashes[key]
+            previous = _jump(h, n)[1]
+            del self._jumps[previous][key]
+            if not self._jumps[previous]:
+                del self._jumps[previous]
+            home, jump = _jump(h, n - 1)
+            self._homes[home][key] = None
+            self._jumps.setdefault(jump, {})[key] = None
+            if key not in self.overflow:
+                if self.ring[home] != last:
+                    displaced.append(key)  # Was on its home, which now is another node
+            elif self.overflow[key] == self.ring[home]:
+                del self.overflow[key]
+        for key in displaced:
+            self._detach(key)
+            pending.append((key, last))
+
+        while len(self.ring) * self.upper_bound < len(self.keys) + len(pending):
+            new = max(self.ring) + 1 if self.ring else 0
+            plan.add.append(new)
+            self._append(new, plan)
+        capacity = self._capacity(len(self.keys) + len(pending))
+        for key, source in pending:
+            h = self.hashes.pop(key)
+            destination = self._choose(h, capacity)
+            self._assign(key, destination, h)
+            if destination != source:
+                plan.moves.append((key, source, destination))
+        return plan
+
+    def _append(self, node, plan):
+        """
+        Appends a node to the ring and moves it the keys whose home it becomes, while it has room.
+        Those that do not fit stay where they are, in the overflow table.
+        """
+        self.ring.append(node)
+        self.nodes[node] = {}
+        self.load_index.add(node)
+        self._homes.append({})
+        self._update_k()
+        self.version += 1
+
+        n = len(self.ring)
+        capacity = self._capacity(len(self.keys))
+        for key in self._jumps.pop(n - 1, {}):
+            h = self.hashes[key]
+            del self._homes[_jump(h, n - 1)[0]][key]
+            home, jump = _jump(h, n)
+            self._homes[home][key] = None
+            self._jumps.setdefault(jump, {})[key] = None
+            source = self.keys[key]
+            if key in self.overflow:
+                continue  # Spilled keys stay put
+            if self.load_index.loads[node] < capacity:
+                self._move(key, source, node)
+                plan.moves.append((key, source, node))
+            else:
+                self.overflow[key] = source
+
+    def _choose(self, h, capacity):
+        """
+        Follows the traversal from a hash's home index for a node under the capacity, falling back
+        to the least loaded node.
+        Returns:
+            The node to insert into, or None if every node is at the upper bound.
+        """
+        if not self.ring:
+            return None
+        n = len(self.ring)
+        home = home_index(h, n)
+        loads = self.load_index.loads
+        for step in range(min(self.probes, n)):
+            node = self.ring[(home + offset(step, self.k)) % n]
+            if loads[node] < capacity:
+                return node
+
+        node = self.load_index.least_loaded()
+        return node if loads[node] < self.upper_bound else None
+
+    def _capacity(self, total):
+        """
+        Calculates how many keys a node may hold before keys spill over to the next node of the traversal.
+        """
+        if not self.ring:
+            return 0
+        return max(1, min(self.upper_bound, math.ceil(self.load_factor * total / len(self.ring))))
+
+    def _assign(self, key, node, h):
+        """
+        Maps a key to a node, recording it in the overflow table unless the node is its home.
+        """
+        home, jump = _jump(h, len(self.ring))
+        self.keys[key] = node
+        self.hashes[key] = h
+        self.nodes[node][key] = None
+        self.load_index.adjust(node, 1)
+        self._homes[home][key] = None
+        self._jumps.setdefault(jump, {})[key] = None
+        if node != self.ring[home]:
+            self.overflow[key] = node
+            self.version += 1
+
+    def _move(self, key, source, destination):
+        """
+        Moves a key between nodes, keeping its home and jump entries.
+        """
+        self.keys[key] = destination
+        del self.nodes[source][key]
+        self.nodes[destination][key] = None
+        self.load_index.adjust(source, -1)
+        self.load_index.adjust(destination, 1)
+
+    def _detach(self, key):
+        """
+        Removes a key from every map, but leaves its hash for a later _assign.
+        """
+        home, jump = _jump(self.hashes[key], len(self.ring))
+        node = self.keys.pop(key)
+        del self.nodes[node][key]
+        self.load_index.adjust(node, -1)
+        del self._homes[home][key]
+        jumps = self._jumps[jump]
+        del jumps[key]
+        if not jumps:
+            del self._jumps[jump]
+        if self.overflow.pop(key, None) is not None:
+            self.version += 1
+
+    def _update_k(self):
+        """
+        Updates the value of k based on the current number of nodes.
+        """
+        self.k = math.ceil(len(self.ring) / 2)
@@ -0,0 +1,845 @@
+import math
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import accumulate, islice, repeat
+
+from .load_index import LoadIndex
+from .migration import MigrationPlan
+from .traversal import displacement, offset
+
+class SelfBalancingRing:
+    def __init__(self, initial_nodes, upper_bound, lower_bound, variance_factor, weights=None, replication=1):
+        """
+        Initializes the SelfBalancingRing object.
+        Args:
+            initial_nodes (list): Initial list of nodes.
+            upper_bound (int): The upper limit of keys a node can have before triggering rebalancing.
+            lower_bound (int): The lower limit of keys a node can have before triggering rebalancing.
+            variance_factor (int): How many keys apart the loads of two nodes may be.
+            weights (dict): Map of nodes to their capacity relative to a node of weight 1, which is
+                the default. Bounds, the variance check and rebalancing targets scale with it.
+            replication (int): The number of nodes holding each key: its node and the next distinct
+                nodes of the traversal from it, starting with its +k partner. The bounds, the variance
+                check and rebalancing count a node's own keys only, not the replicas it stores, see stored.
+        """
+        self.ring = initial_nodes or []
+        self.upper_bound = upper_bound
+        self.lower_bound = lower_bound
+        self.variance_factor = variance_factor
+        self.replication = replication
+        self.weights = {}  # Map of nodes to their weight, for weights other than 1
+        _check_weights(weights or {})
+        self.weights.update((node, weight) for node, weight in (weights or {}).items() if weight != 1)
+
+        self.current = 0
+        self.keys = {}
+        self.nodes = {node: OrderedDict() for node in self.ring}  # Map nodes to keys, in insertion order with O(1) removal
+        self.load_index = LoadIndex(self.ring, self.weights)  # Nodes bucketed by number of keys per weight
+        self.instrumentation = None  # Optional Instrumentation, see Instrumentation.attach
+        self.journal = None  # While a set, collects the keys whose node changes (see ConcurrentRing)
+        self.in_transit = {}  # Map of keys being moved by migrate_async to their (source, destination)
+        self.reads = {}  # Map of nodes to the number of reads route_read sent them, joining nodes starting at the mean
+        self.i = 0
+        self._update_k()
+
+    def insert_node(self, node, dry_run=False, weight=1):
+        """
+        Inserts a node into the ring, moves the fewest keys needed to rebalance and updates the traversal pattern.
+        Args:
+            node (int): The node to insert.
+            dry_run (bool): Only plan the migration, without changing the ring.
+            weight (float): The capacity of the node relative to a node of weight 1.
+        Returns:
+            MigrationPlan: The applied (or planned) migration.
+        """
+        plan = self.plan_migration(add=[node], weights={node: weight})
+        if dry_run:
+            return plan
+        self.apply_migration(plan)
+        return plan
+
+    def remove_node(self, node, dry_run=False):
+        """
+        Removes a node from the ring, moves its keys with the fewest moves and updates the traversal pattern.
+        Args:
+            node (int): The node to remove.
+            dry_run (bool): Only plan the migration, without changing the ring.
+        Returns:
+            MigrationPlan: The applied (or planned) migration.
+        """
+        plan = self.plan_migration(remove=[node])
+        if dry_run:
+            return plan
+        self.apply_migration(plan)
+        return plan
+
+    def set_weight(self, node, weight, dry_run=False):
+        """
+        Changes the capacity weight of a node and moves the fewest keys needed to rebalance.
+        Args:
+            node (int): The node to reweight.
+            weight (float): The capacity of the node relative to a node of weight 1.
+            dry_run (bool): Only plan the migration, without changing the ring.
+        Returns:
+            MigrationPlan: The applied (or planned) migration.
+        """
+        if node not in self.nodes:
+            raise ValueError("Node not found in the ring.")
+        plan = self.plan_migration(weights={node: weight})
+        if dry_run:
+            return plan
+        self.apply_migration(plan)
+        return plan
+
+    def plan_migration(self, add=(), remove=(), weights=None):
+        """
+        Plans a topology change with the fewest key moves that bring every node within the bounds
+        and within variance_factor of each other, in keys per unit of weight. Nodes are added if the
+        remaining ones cannot hold all keys under the upper bound. The ring is not changed.
+        Args:
+            add (iterable): Nodes joining the ring.
+            remove (iterable): Nodes leaving the ring.
+            weights (dict): New weights of joining or existing nodes.
+        Returns:
+            MigrationPlan: The nodes to add and remove, the new weights and the (key, source, destination) moves.
+        """
+        add, remove, weights = list(add), list(remove), dict(weights or {})
+        if len(set(add)) != len(add) or any(node in self.nodes for node in add):
+            raise ValueError("Node already exists in the ring.")
+        if len(set(remove)) != len(remove) or any(node not in self.nodes for node in remove):
+            raise ValueError("Node not found in the ring.")
+        leaving = set(remove)
+        if any(node in leaving or (node not in self.nodes and node not in add) for node in weights):
+            raise ValueError("Node not found in the ring.")
+        _check_weights(weights)
+
+        def weight(node):
+            return weights.get(node, self.weights.get(node, 1))
+
+        staying = [node for node in self.ring if node not in leaving]
+
+        # Add nodes until all keys fit under the upper bound
+        new_node = max(self.ring + add) + 1 if self.ring or add else 0
+        capacity = sum(math.floor(self.upper_bound * weight(node)) for node in staying + add)
+        while capacity < len(self.keys):
+            add.append(new_node)
+            new_node += 1
+            capacity += self.upper_bound
+
+        loads = {node: len(self.nodes[node]) for node in staying}
+        loads.update((node, 0) for node in add)
+        weighted = any(weight(node) != 1 for node in loads)
+        scale = {node: weight(node) for node in loads}
+        order = sorted(loads, key=lambda node: loads[node] / scale[node])
+        low, high = self._target_window([loads[node] for node in order], [scale[node] for node in order],
+                                         sum(len(self.nodes[node]) for node in remove))
+        highs = {node: math.floor(high * scale[node]) for node in loads}
+        lows = {node: math.ceil(low * scale[node]) for node in loads}
+
+        # Keys leave the removed nodes and nodes above the window, oldest first
+        pending = {node: iter(self.nodes[node]) for node in staying}
+        outgoing = [(key, node) for node in remove for key in self.nodes[node]]
+        for node, load in loads.items():
+            if load > highs[node]:
+                outgoing.extend((key, node) for key in islice(pending[node], load - highs[node]))
+                loads[node] = highs[node]
+
+        # Nodes below the window need more keys than that: take them from the most loaded nodes
+        deficit = sum(lows[node] - load for node, load in loads.items() if load < lows[node])
+        if deficit > len(outgoing):
+            donors = sorted(staying, key=lambda node: loads[node] / scale[node], reverse=True)
+            counts = _fill([-loads[node] for node in donors], deficit - len(outgoing),
+                           [scale[node] for node in donors] if weighted else None,
+                           [0] * len(donors) if weighted else None)
+            for node, count in zip(donors, counts):
+                if not count:
+                    continue
+                outgoing.extend((key, node) for key in islice(pending[node], count))
+                loads[node] -= count
+
+        # Place the outgoing keys on the least loaded nodes first, other than the nodes they come
+        # from if the rest have room: giving a donor keys back would only move them in a circle
+        moves = []
+        limits = {node: math.floor(self.upper_bound * scale[node]) for node in loads}
+        sources = {source for _, source in outgoing}
+        receivers = [node for node in loads if node not in sources]
+        if sum(limits[node] - loads[node] for node in receivers) < len(outgoing):
+            receivers = list(loads)
+        receivers.sort(key=lambda node: loads[node] / scale[node])
+        counts = _fill([loads[node] for node in receivers], len(outgoing),
+                       [scale[node] for node in receivers] if weighted else None,
+                       [limits[node] for node in receivers] if weighted else None)
+        start = 0
+        for node, count in zip(receivers, counts):
+            moves.extend((key, source, node) for key, source in outgoing[start:start + count] if source != node)
+            start += count
+
+        changed = {node: value for node, value in weights.items() if value != self.weights.get(node, 1)}
+        return MigrationPlan(add, remove, moves, changed)
+
+    def apply_migration(self, plan):
+        """
+        Applies a MigrationPlan. The plan is checked against the current state of the ring first,
+        so a stale plan raises ValueError without changing anything.
+        Args:
+            plan (MigrationPlan): The plan to apply, usually from plan_migration.
+        """
+        self._check_migration(plan)
+        self._join(plan.add, plan.weights)
+
+        deltas = {}
+        if self.journal is not None:
+            self.journal.update(key for key, _, _ in plan.moves)
+        for key, source, destination in plan.moves:
+            del self.nodes[source][key]
+            self.nodes[destination][key] = None
+            self.keys[key] = destination
+            deltas[source] = deltas.get(source, 0) - 1
+            deltas[destination] = deltas.get(destination, 0) + 1
+        for node, delta in deltas.items():
+            self.load_index.adjust(node, delta)
+        if self.instrumentation is not None:
+            self.instrumentation.keys_moved(plan.moves)
+
+        self._leave(plan.remove)
+
+    async def migrate_async(self, plan, mover, batch_size=64, concurrency=8):
+        """
+        Applies a MigrationPlan incrementally. Joining nodes are added first, then the keys move in
+        batches of at most batch_size: for each, `await mover(key, source, destination)` copies the
+        data, with at most `concurrency` moves in flight, and only then is the key remapped. Until
+        then lookup keeps returning the source, and lookup_owners returns both owners. Leaving nodes
+        are removed once empty; keys inserted on them meanwhile are moved by a follow-up migration.
+        Args:
+            plan (MigrationPlan): The plan to apply, usually from plan_migration.
+            mover (callable): Async callable copying a key's data from the source to the destination node.
+            batch_size (int): The number of moves started together.
+            concurrency (int): The number of moves awaited at the same time.
+        """
+        import asyncio
+
+        self._check_migration(plan)
+        self._join(plan.add, plan.weights)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def move(key, source, destination):
+            async with semaphore:
+                try:
+                    if self.keys.get(key) != source:
+                        return False  # Removed or remapped while waiting for its turn
+                    await mover(key, source, destination)
+                    # The key may also have been removed or remapped while its data was copied
+                    if self.keys.get(key) == source and destination in self.nodes:
+                        self._unassign(key)
+                        self._assign(key, destination)
+                        return True
+                    return False
+                finally:
+                    del self.in_transit[key]
+
+        for start in range(0, len(plan.moves), batch_size):
+            batch = plan.moves[start:start + batch_size]
+            self.in_transit.update((key, (source, destination)) for key, source, destination in batch)
+            moved = await asyncio.gather(*(move(*entry) for entry in batch))
+            if self.instrumentation is not None:
+                self.instrumentation.keys_moved([entry for entry, done in zip(batch, moved) if done])
+
+        leaving = [node for node in plan.remove if node in self.nodes]
+        if any(self.nodes[node] for node in leaving):
+            await self.migrate_async(self.plan_migration(remove=leaving), mover, batch_size, concurrency)
+        else:
+            self._leave(leaving)
+
+    async def add_node_async(self, node, mover, batch_size=64, concurrency=8, weight=1):
+        """
+        Inserts a node, migrating keys to it incrementally with migrate_async.
+        Args:
+            node (int): The node to insert.
+            mover (callable): Async callable copying a key's data from the source to the destination node.
+            batch_size (int): The number of moves started together.
+            concurrency (int): The number of moves awaited at the same time.
+            weight (float): The capacity of the node relative to a node of weight 1.
+        Returns:
+            MigrationPlan: The applied migration.
+        """
+        plan = self.plan_migration(add=[node], weights={node: weight})
+        await self.migrate_async(plan, mover, batch_size, concurrency)
+        return plan
+
+    async def remove_node_async(self, node, mover, batch_size=64, concurrency=8):
+        """
+        Removes a node, migrating its keys away incrementally with migrate_async.
+        Args:
+            node (int): The node to remove.
+            mover (callable): Async callable copying a key's data from the source to the destination node.
+            batch_size (int): The number of moves started together.
+            concurrency (int): The number of moves awaited at the same time.
+        Returns:
+            MigrationPlan: The applied migration.
+        """
+        plan = self.plan_migration(remove=[node])
+        await self.migrate_async(plan, mover, batch_size, concurrency)
+        return plan
+
+    def insert_key(self, key):
+        """
+        Inserts or updates a key-value pair in the ring in a balanced manner and updates the map.
+        Args:
+            key: The key to insert or update.
+        """
+        if key in self.keys:
+            raise ValueError("Key already exists in the ring.")
+        
+        # Follow the traversal, falling back to the least loaded node, which always passes the variance check
+        node = self._probe()
+        if node is None or len(self.nodes[node]) >= self._limit(node):
+            node = self.load_index.least_loaded()
+
+        if node is None or len(self.nodes[node]) >= self._limit(node):
+            # All nodes are full, add a new node. Rebalancing may fill it, so take any node with room
+            new_node = max(self.ring) + 1 if self.ring else 0
+            self.insert_node(new_node)
+            node = min((node for node in self.nodes if len(self.nodes[node]) < self._limit(node)), key=self._load)
+
+        # Add to maps
+        self._assign(key, node)
+
+    def remove_key(self, key):
+        """
+        Removes a key from the ring and updates the map.
+        Args:
+            key: The key to remove.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+        
+        # Locate the node, and remove from maps
+        node = self._unassign(key)
+
+        # Handle underflow
+        if len(self.nodes[node]) < self.lower_bound * self.weights.get(node, 1):
+            self.remove_node(node)
+
+    def insert_keys(self, keys):
+        """
+        Inserts many keys at once. The number of nodes needed is computed once and the keys are
+        spread over the least loaded nodes in a single pass, without intermediate redistributions.
+        Args:
+            keys (iterable): The keys to insert.
+        """
+        keys = list(keys)
+        if len(dict.fromkeys(keys)) != len(keys) or not self.keys.keys().isdisjoint(keys):
+            raise ValueError("Key already exists in the ring.")
+
+        self._place(keys)
+
+    def remove_keys(self, keys):
+        """
+        Removes many keys at once. Nodes that fall under the lower bound are removed together and
+        their keys placed in a single pass, keeping enough nodes to respect the upper bound.
+        Args:
+            keys (iterable): The keys to remove.
+        """
+        keys = list(keys)
+        batch = dict.fromkeys(keys)
+        if len(batch) != len(keys) or not self.keys.keys() >= batch.keys():
+            raise KeyError("Key not found in the ring.")
+
+        if self.journal is not None:
+            self.journal.update(batch)
+        removed = {}
+        for key in batch:
+            node = self.keys.pop(key)
+            del self.nodes[node][key]
+            removed[node] = removed.get(node, 0) + 1
+        for node, count in removed.items():
+            self.load_index.adjust(node, -count)
+
+        # Handle underflow, sparing the fullest nodes if the rest could not hold all keys
+        underflow = [node for node in removed if len(self.nodes[node]) < self.lower_bound * self.weights.get(node, 1)]
+        underflow.sort(key=lambda node: len(self.nodes[node]))
+        capacity = sum(self._limit(node) for node in self.ring) - sum(self._limit(node) for node in underflow)
+        while underflow and capacity < len(self.keys):
+            capacity += self._limit(underflow.pop())
+        if not underflow:
+            return
+
+        orphans = []
+        for node in underflow:
+            orphans.extend(self.nodes.pop(node))
+            self.load_index.remove(node)
+            self.weights.pop(node, None)
+            self.reads.pop(node, None)
+        self.ring[:] = [node for node in self.ring if node in self.nodes]
+        self._update_k()
+
+        sources = {key: self.keys.pop(key) for key in orphans}
+        self._place(orphans)
+
+        if self.instrumentation is not None:
+            # Same order as apply_migration: the moves, then the nodes that left
+            self.instrumentation.keys_moved([(key, source, self.keys[key]) for key, source in sources.items()])
+            for node in underflow:
+                self.instrumentation.node_left(node)
+
+    def lookup(self, key):
+        """
+        Retrieves the value associated with a key in the ring.
+        Args:
+            key: The key to retrieve the value for.
+        Returns:
+            int: The node responsible for the key.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+        return self.keys[key]
+
+    def lookup_owners(self, key):
+        """
+        Retrieves the nodes holding a key, which are two while migrate_async moves it.
+        Args:
+            key: The key to retrieve the nodes for.
+        Returns:
+            tuple: The node responsible for the key, followed by the node it is moving to, if any.
+        """
+        if key in self.in_transit and self.in_transit[key][0] == self.lookup(key):
+            return self.in_transit[key]
+        return (self.lookup(key),)
+
+    def replicas(self, key):
+        """
+        Retrieves the nodes holding copies of a key. Copies follow the key's node, so rebalancing
+        moves them along and they always land on distinct nodes. The ring only computes where the
+        copies go: storing them is up to the caller.
+        Args:
+            key: The key to retrieve the nodes for.
+        Returns:
+            tuple: The node responsible for the key, followed by its replica nodes.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+        return self._replica_set(self.keys[key])
+
+    def stored(self, node):
+        """
+        Counts the copies of keys a node stores: its own keys and the replicas of the nodes whose
+        replica sets include it. With balanced loads that is about replication times its own load,
+        which upper_bound does not limit, so size the bounds by storage / replication.
+        Args:
+            node (int): The node.
+        Returns:
+            int: The number of copies.
+        """
+        if node not in self.nodes:
+            raise ValueError("Node not found in the ring.")
+        if self.replication == 1:
+            return len(self.nodes[node])
+        return sum(len(self.nodes[other]) for other in self.ring if node in self._replica_set(other))
+
+    def route_read(self, key):
+        """
+        Picks the replica of a key that was sent the fewest reads per unit of weight, and counts the read.
+        Nodes that join are counted as if they had had their share of the earlier reads, so they are
+        not sent every read until they catch up.
+        Args:
+            key: The key to read.
+        Returns:
+            int: The node to read the key from.
+        """
+        reads, weights = self.reads, self.weights
+        node = min(self.replicas(key), key=lambda node: reads.get(node, 0) / weights.get(node, 1))
+        reads[node] = reads.get(node, 0) + 1
+        return node
+
+    def remap(self, key, node):
+        """
+        Remaps a key to a specific node.
+        Args:
+            key: The key to remap.
+            node: The node to map the key to.
+        """
+        if key not in self.keys:
+            raise KeyError("Key not found in the ring.")
+        self._unassign(key)
+        self._assign(key, node)
+    
+    def next(self):
+        """
+        Calculates the next index based on the balanced traversal.
+        Returns:
+            int: The next index.
+        """
+        if self.i == 0:
+            self.current = 0
+        else:
+            step = self.pattern[self.i % 4]  # Determine the step based on the pattern
+            self.current = (self.current + step) % len(self.ring)  # Calculate the next index
+            
+        self.i += 1  # Increment the step index
+        return self.current  # Return the new current index
+
+    def previous(self):
+        """
+        Calculates the previous index based on the balanced traversal rule.
+        Returns:
+            int: The previous index.
+        """
+        self.i -= 1  # Decrement the step index
+        step = self.pattern[self.i % 4]  # Determine the reverse step
+        self.current = (self.current - step) % len(self.ring) # Calculate the previous index
+        return self.current  # Return the new current index
+
+    def position_at(self, i):
+        """
+        Calculates the index reached after i steps of the traversal without walking it.
+        Args:
+            i (int): The step count, as held by self.i.
+        Returns:
+            int: The index self.current holds after i calls to next() from step 0.
+        """
+        if i <= 0:
+            return 0
+        # The first step resets to 0, the remaining ones follow the pattern from step 1
+        return displacement(1, i, self.k) % len(self.ring)
+
+    def seek(self, i):
+        """
+        Moves the traversal directly to step i in O(1).
+        Args:
+            i (int): The step count to move to.
+        Returns:
+            int: The new current index.
+        """
+        self.current = self.position_at(i)
+        self.i = i
+        return self.current
+
+    def seek_back(self, m):
+        """
+        Moves the traversal back m steps in O(1), equivalent to calling previous() m times.
+        Args:
+            m (int): The number of steps to move back.
+        Returns:
+            int: The new current index.
+        """
+        self.current = (self.current - displacement(self.i - m, self.i, self.k)) % len(self.ring)
+        self.i -= m
+        return self.current
+
+    def _place(self, keys):
+        """
+        Assigns keys that are not in the ring yet, adding the nodes needed to stay within the
+        upper bound and filling the least loaded nodes first.
+        """
+        if self.journal is not None:
+            self.journal.update(keys)
+        capacity = sum(self._limit(node) for node in self.ring)
+        while capacity < len(self.keys) + len(keys):
+            self._join([max(self.ring) + 1 if self.ring else 0])
+            capacity += self.upper_bound
+
+        nodes = sorted(self.nodes, key=self._load)
+        weights = [self.weights.get(node, 1) for node in nodes] if self.weights else None
+        limits = [self._limit(node) for node in nodes] if self.weights else None
+        start = 0
+        for node, count in zip(nodes, _fill([len(self.nodes[node]) for node in nodes], len(keys), weights, limits)):
+            if count:
+                chunk = keys[start:start + count]
+                self.keys.update(zip(chunk, repeat(node)))
+                if self.nodes[node]:
+                    self.nodes[node].update(zip(chunk, repeat(None)))
+                else:
+                    self.nodes[node] = OrderedDict.fromkeys(chunk)
+                self.load_index.adjust(node, count)
+                start += count
+
+    def _probe(self, probes=2):
+        """
+        Follows the traversal for a +k pair whose first node passes the variance check, against its
+        partner and against the least loaded node, per unit of weight. Pairs occur on every other
+        step, so a couple of probes are enough.
+        Returns:
+            The node to insert into, or None if no probed node qualifies.
+        """
+        for _ in range(min(probes, len(self.ring))):
+            index = self.next()
+            partner = self.next()
+            self.previous() # Restore the step counter after getting the next
+
+            if abs(partner - index) == self.k:
+                node, other = self.ring[index], self.ring[partner]
+                load = self._load(node) - self.variance_factor
+                if load <= self._load(other) and load <= self.load_index.minimum:
+                    return node
+        return None
+
+    def _load(self, node):
+        """
+        Calculates the number of keys of a node per unit of weight.
+        """
+        load = len(self.nodes[node])
+        return load / self.weights[node] if node in self.weights else load
+
+    def _limit(self, node):
+        """
+        Calculates the number of keys a node can hold under the upper bound.
+        """
+        return math.floor(self.upper_bound * self.weights[node]) if node in self.weights else self.upper_bound
+
+    def _assign(self, key, node):
+        """
+        Maps a key to a node and updates the load index.
+        """
+        self.keys[key] = node
+        self.nodes[node][key] = None
+        self.load_index.adjust(node, 1)
+        if self.journal is not None:
+            self.journal.add(key)
+
+    def _unassign(self, key):
+        """
+        Removes a key from its node and updates the load index.
+        Returns:
+            The node the key was mapped to.
+        """
+        node = self.keys.pop(key)
+        del self.nodes[node][key]
+        self.load_index.adjust(node, -1)
+        if self.journal is not None:
+            self.journal.add(key)
+        return node
+
+    def _update_k(self):
+        """
+        Updates the value of k based on the current number of nodes.
+        """
+        self.k = math.ceil(len(self.ring) / 2)  # Calculate k as the ceiling of the number of nodes / 2
+        self.pattern = [+self.k, +1, -self.k, +1]  # The traversal step pattern
+        self._replica_sets = {}  # Map of nodes to their replica sets, rebuilt when the ring changes
+
+    def _replica_set(self, node):
+        """
+        Retrieves the replica set of a node, computing it on first use after each change of the ring.
+        """
+        if self.replication == 1:
+            return (node,)
+        if node not in self._replica_sets:
+            self._replica_sets[node] = self._partners(node)
+        return self._replica_sets[node]
+
+    def _partners(self, node):
+        """
+        Follows the traversal from a node, starting with its +k partner, for the distinct nodes that hold
+        copies of its keys. A period of the traversal visits every index, so the walk always ends.
+        Returns:
+            tuple: The node followed by its replica nodes.
+        """
+        n = len(self.ring)
+        start = self.ring.index(node)
+        found = [node]
+        step = 1
+        while len(found) < min(self.replication, n):
+            candidate = self.ring[(start + offset(step, self.k)) % n]
+            if candidate not in found:
+                found.append(candidate)
+            step += 1
+        return tuple(found)
+
+    def _check_migration(self, plan):
+        """
+        Checks that a MigrationPlan matches the current nodes and keys of the ring.
+        """
+        leaving = set(plan.remove)
+        final = (set(self.nodes) - leaving) | set(plan.add)
+        if any(node in self.nodes for node in plan.add) or not leaving <= self.nodes.keys():
+            raise ValueError("Migration plan does not match the ring's nodes.")
+        if any(node not in final or node in leaving for node in plan.weights):
+            raise ValueError("Migration plan does not match the ring's nodes.")
+        if any(self.keys.get(key) != source or source == destination or destination not in final
+               for key, source, destination in plan.moves):
+            raise ValueError("Migration plan does not match the ring's keys.")
+        if sum(1 for _, source, _ in plan.moves if source in leaving) != sum(len(self.nodes[node]) for node in leaving):
+            raise ValueError("Migration plan leaves keys on removed nodes.")
+
+    def _join(self, nodes, weights=None):
+        """
+        Adds empty nodes to the ring, applies new node weights and updates the traversal pattern.
+        """
+        weights = weights or {}
+        for node, weight in weights.items():
+            if weight != 1:
+                self.weights[node] = weight
+            else:
+                self.weights.pop(node, None)
+            if node in self.nodes:
+                self.load_index.remove(node)
+                self.load_index.add(node, len(self.nodes[node]), weight)
+        if self.reads:  # Only nodes of the ring have read counts
+            level = sum(self.reads.values()) / sum(self.weights.get(node, 1) for node in self.ring)
+        for node in nodes:
+            self.ring.append(node)
+            self.nodes[node] = OrderedDict()
+            self.load_index.add(node, weight=weights.get(node, 1))
+            if self.reads:
+                self.reads[node] = level * weights.get(node, 1)  # Start at the mean reads per unit of weight
+        self._update_k()  # Update k and the step pattern
+
+        if self.instrumentation is not None:
+            for node in nodes:
+                self.instrumentation.node_joined(node)
+
+    def _leave(self, nodes):
+        """
+        Removes empty nodes from the ring and updates the traversal pattern.
+        """
+        for node in nodes:
+            del self.nodes[node]
+            self.load_index.remove(node)
+            self.weights.pop(node, None)
+            self.reads.pop(node, None)
+        leaving = set(nodes)
+        self.ring[:] = [node for node in self.ring if node not in leaving]
+        self._update_k()  # Update k and the step pattern
+
+        if self.instrumentation is not None:
+            for node in nodes:
+                self.instrumentation.node_left(node)
+
+    def _target_window(self, loads, weights, leaving):
+        """
+        Chooses the load window [low, high], in keys per unit of weight, that the ring can reach with
+        the fewest moves. Keys above high and on leaving nodes must move out, nodes below low must be
+        filled up, so the cost of a window is the larger of the two. Windows honoring the lower bound win.
+        Args:
+            loads (list): The loads of the nodes that stay or join, ascending per unit of weight.
+            weights (list): The weights of those nodes.
+            leaving (int): The number of keys on nodes that leave.
+        Returns:
+            tuple: The (low, high) bounds of the window.
+        """
+        n = len(loads)
+        total = sum(loads) + leaving
+        if not n:
+            return 0, 0
+
+        spread = max(self.variance_factor, 1)  # An exact split is not always possible
+
+        if all(weight == 1 for weight in weights):
+            prefix = list(accumulate(loads, initial=0))
+
+            def capacity(high):
+                return high * n
+
+            def excess(high):
+                j = bisect_right(loads, high)
+                return leaving + prefix[n] - prefix[j] - high * (n - j)
+
+            def deficit(low):
+                j = bisect_left(loads, low)
+                return low * j - prefix[j]
+        else:
+            def capacity(high):
+                return sum(math.floor(high * weight) for weight in weights)
+
+            def excess(high):
+                return leaving + sum(max(0, load - math.floor(high * weight)) for load, weight in zip(loads, weights))
+
+            def deficit(low):
+                return sum(max(0, math.ceil(low * weight) - load) for load, weight in zip(loads, weights))
+
+        average = total / sum(weights)
+        best = None
+        for low in range(max(0, math.ceil(average) - spread), math.floor(average) + 1):
+            high = min(low + spread, self.upper_bound)
+            if capacity(high) < total:
+                continue
+            cost = (low < self.lower_bound, max(excess(high), deficit(low)))
+            if best is None or cost < best[0]:
+                best = (cost, low, high)
+        if best is None:
+            # Rounding small weights down leaves no room within the spread: only the bounds apply
+            return 0, self.upper_bound
+        return best[1], best[2]
+
+    def print_node_sizes(self):
+        """
+        Prints the sizes of all nodes for debugging.
+        """
+        print("Node sizes:")
+        for node, keys in self.nodes.items():
+            print(f"Node {node}: {len(keys)} keys")
+
+def _fill(loads, count, weights=None, limits=None):
+    """
+    Splits count keys over nodes with ascending loads so that the least loaded are lifted first.
+    Args:
+        loads (list): The loads of the nodes, in ascending order per unit of weight.
+        count (int): The number of keys to add.
+        weights (list): The weights of the nodes, None if all are 1.
+        limits (list): The most keys each weighted node may hold, None for no limit.
+    Returns:
+        list: The number of keys to add to each node.
+    """
+    if weights is not None:
+        return _weighted_fill(loads, count, weights, limits)
+
+    # Find how many nodes receive keys: the most for which lifting them to the same level fits
+    total = 0
+    receivers = 0
+    for j, load in enumerate(loads):
+        if load * j - total > count:
+            break
+        total += load
+        receivers = j + 1
+
+    if not receivers:
+        return [0] * len(loads)
+    level, extra = divmod(count + total, receivers)
+    return [level - load + (j < extra) for j, load in enumerate(loads[:receivers])] + [0] * (len(loads) - receivers)
+
+def _weighted_fill(loads, count, weights, limits=None):
+    """
+    Splits count keys like _fill, lifting the nodes to the same load per unit of weight without
+    taking any node past its limit.
+    """
+    if limits is None:
+        limits = [math.inf] * len(loads)
+    total = 0
+    capacity = 0
+    receivers = 0
+    for j, (load, weight) in enumerate(zip(loads, weights)):
+        if load / weight * capacity - total > count:
+            break
+        total += load
+        capacity += weight
+        receivers = j + 1
+
+    if not receivers:
+        return [0] * len(loads)
+    level = (count + total) / capacity
+    counts = [max(0, min(math.floor(level * weight), limit) - load)
+              for load, weight, limit in zip(loads[:receivers], weights[:receivers], limits)]
+    counts += [0] * (len(loads) - receivers)
+    # Rounding and the limits leave a few keys over (or short): settle them on the nodes that stay
+    # lowest and have room (or highest)
+    remainder = count - sum(counts)
+    while remainder > 0:
+        room = [j for j in range(len(loads)) if loads[j] + counts[j] < limits[j]] or range(len(loads))
+        lowest = sorted(room, key=lambda j: (loads[j] + counts[j] + 1) / weights[j])[:remainder]
+        for j in lowest:
+            counts[j] += 1
+        remainder -= len(lowest)
+    while remainder < 0:
+        highest = max((j for j in range(receivers) if counts[j]), key=lambda j: (loads[j] + counts[j]) / weights[j])
+        counts[highest] -= 1
+        remainder += 1
+    return counts
+
+
+def _check_weights(weights):
+    """
+    Checks that node weights are positive numbers.
+    """
+    if any(not weight > 0 for weight in weights.values()):
+        raise ValueError("Node weights must be positive.")
@@ -0,0 +1,198 @@
+import math
+from functools import lru_cache
+
+from .traversal import PERIOD_CACHE_SIZE, offset, period, positions
+
+"""
+A closer look at the traversal sequence.
+
+Attributes:
+    n (int): The number of nodes, or size of the circular array.
+    k (int): Approximately half the size of the circular array, used in traversal steps.
+    i (int): Internal counter to keep track of the current step in the traversal pattern.
+    current (int): The current position in the traversal.
+    sequence (list): The generated sequence or traversal order.
+    num_visits (map): A map tracking the number of times each node has been visited (for simulation purposes).
+
+Methods:
+    __init__(self, n): Initializes the BalancedSequence instance with the size of the circular array.
+    next(self): Gets the next node in the traversal sequence.
+    position_at(self, i): Gets the node current holds after i steps, in O(1).
+    seek(self, i): Moves the traversal directly to step i, in O(1).
+    generate(self, length, vectorized=False): Runs the traversal up to a specified length.
+"""
+class Sequence:
+
+    def __init__(self, n):
+        # n, number of nodes, or size of the circular array.
+        self.n = n
+        # k, approximately half the size of the circular array.
+        self.k = math.ceil(n / 2)
+        # Internal step counter
+        self.i = 0
+        # Current number in the sequence, or index of the circular array.
+        self.current = 0
+        # The generated sequence, or traversal order.
+        self.sequence = []
+        # Number of times each node has been visited.
+        self.num_visits = {i: 0 for i in range(n)}
+    
+    def generate(self, length, vectorized=False):
+        if vectorized:
+            return self._generate_vectorized(length)
+
+        # Reset any previous sequence and visits
+        self.i = 0
+        self.current = 0
+        self.sequence = []
+        self.num_visits = {i: 0 for i in range(self.n)}
+
+        for _ in range(length):
+            next = self.next()
+            # Update the sequence.
+            self.sequence.append(next)
+            self.num_visits[next] = self.num_visits.get(next, 0) + 1
+
+        return self.sequence, self.num_visits
+
+    def _generate_vectorized(self, length):
+        import numpy as np
+
+        # Tile the cached period instead of stepping, then count visits in one pass.
+        self.sequence = positions(self.n, 0, length)
+        self.num_visits = np.bincount(self.sequence, minlength=self.n)
+        self.i = length
+        self.current = int(self.sequence[-1]) if length else 0
+
+        return self.sequence, self.num_visits
+
+    def next(self):
+        if self.i == 0:
+            # Start with 0
+            next = 0
+        else:
+            """
+            (+k, +1, -k, +1) pattern.
+                Gets the next index of the circular array.
+            """
+            if self.i % 4 == 1:
+                next = self.current + self.k
+            elif self.i % 4 == 2:
+                next = self.current + 1
+            elif self.i % 4 == 3:
+                next = self.current - self.k
+            elif self.i % 4 == 0:
+                next = self.current + 1
+
+        # Keep the index within the circular array.
+        next = next % self.n
+
+        # Update current
+        self.current = next
+
+        # Increment step counter
+        self.i += 1
+
+        return next
+
+    def position_at(self, i):
+        # The first step always yields 0, step i yields the pattern offset of i - 1 steps.
+        if i <= 1:
+            return 0
+        return offset(i - 1, self.k) % self.n
+
+    def seek(self, i):
+        # Jump the traversal to step i without generating the steps in between.
+        self.current = self.position_at(i)
+        self.i = i
+        return self.current
+
+    """
+    This function takes a segment of the sequence, preferrably of length n, 
+    and reflects each element around the midpoint (n-1)/2, and then reverses 
+    the order of the elements. This function is an involution that when done
+    once, provides a later segment of the sequence.
+
+    Args:
+        segment (list of int): The segment of the permutation to be transformed.
+        n (int): The size of the full permutation (number of nodes in the ring).
+
+    Returns:
+        list of int: The transformed segment.
+    """
+    def reflect_and_reverse(permutation, n):
+        return reverse(reflect(permutation, n))
+
+    
+@lru_cache(maxsize=PERIOD_CACHE_SIZE)
+def _period_profile(n):
+    """
+    Computes the visit counts of one full period and the spread (max - min visits) after
+    every prefix of it. Every node is visited equally often over a period, so the spread
+    after m steps only depends on m modulo the period length.
+    """
+    import numpy as np
+
+    cycle = period(n)
+    length = len(cycle)
+    counts = np.bincount(cycle, minlength=n)
+
+    # occurrence[t]: how many times cycle[t] has been visited after step t.
+    order = np.argsort(cycle, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    occurrence = np.empty(length, dtype=np.int64)
+    occurrence[order] = np.arange(length) - starts[cycle[order]] + 1
+
+    # The max grows with the newest visit, the min grows once every node reached a round.
+    maxima = np.concatenate(([0], np.maximum.accumulate(occurrence)))
+    rounds = np.array([np.flatnonzero(occurrence == j).max() + 1 for j in range(1, counts.min() + 1)])
+    minima = np.searchsorted(rounds, np.arange(length + 1), side='right')
+
+    spread = maxima - minima
+    spread[length] = 0
+    for array in (counts, spread):
+        array.flags.writeable = False
+    return counts, spread[:length]
+
+def analyze(n, length):
+    """
+    Analyzes the balance of a traversal of a given length without generating it.
+    Cost depends on n only: the counts come from the period, tiled by arithmetic.
+
+    Args:
+        n (int): The size of the circular array.
+        length (int): The number of steps of the traversal.
+
+    Returns:
+        dict: With the following entries.
+            num_visits (numpy.ndarray): Number of times each node is visited.
+            max_visits (int), min_visits (int), spread (int): Extremes of num_visits and their difference.
+            prefix_discrepancy (numpy.ndarray): Spread after m steps, for m = 0 .. min(length, period) - 1.
+                The profile repeats with the period, so prefix m has discrepancy prefix_discrepancy[m % period].
+            worst_prefix (int): The shortest prefix length with the largest discrepancy.
+            worst_discrepancy (int): The discrepancy of that prefix.
+    """
+    import numpy as np
+
+    counts, profile = _period_profile(n)
+    cycles, remainder = divmod(length, len(profile))
+    num_visits = cycles * counts + np.bincount(period(n)[:remainder], minlength=n)
+
+    window = profile[:min(length + 1, len(profile))]
+    worst = int(np.argmax(window))
+
+    return {
+        'num_visits': num_visits,
+        'max_visits': int(num_visits.max()),
+        'min_visits': int(num_visits.min()),
+        'spread': int(num_visits.max() - num_visits.min()),
+        'prefix_discrepancy': profile[:min(length, len(profile))],
+        'worst_prefix': worst,
+        'worst_discrepancy': int(window[worst]),
+    }
+
+def reverse(permutation):
+    return permutation[::-1]
+
+def reflect(permutation, n):
+    return [(n - 1) - v for v in permutation]
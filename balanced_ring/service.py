@@ -0,0 +1,375 @@
+import asyncio
+import queue
+import socket
+import struct
+import threading
+from array import array
+from itertools import repeat
+
+'''
+A routing service, so that the services of a host share one authoritative SelfBalancingRing instead
+of each embedding a copy. The RingServer owns the ring and serves it over a Unix or TCP socket from
+an asyncio event loop, which also serializes all changes. The RingClient keeps a pool of connections
+and sends requests in batches, pipelining several batches on a connection before reading replies.
+
+Protocol (little-endian). Every request is a header followed by a payload:
+    request      uint32 id, uint8 opcode, uint32 count, uint32 payload length
+    response     uint32 id, uint8 status, uint32 count, uint32 payload length
+Keys are sent as UTF-8 text joined by NUL characters, and nodes as int64 arrays:
+    LOOKUP       keys                     -> int64 node per key, MISSING for unknown keys
+    INSERT       keys                     -> empty
+    REMOVE       keys                     -> empty
+    REMAP        int64 node per key, keys -> empty
+    INSERT_KEY   keys                     -> empty, each key inserted alone
+    REMOVE_KEY   keys                     -> empty, each key removed alone
+A failed request gets the status of its exception and the UTF-8 message as payload. Lookups read
+the key map directly, so they bypass any Instrumentation or HotKeyTracker attached to the ring.
+'''
+
+LOOKUP, INSERT, REMOVE, REMAP, INSERT_KEY, REMOVE_KEY = range(6)
+
+OK, KEY_ERROR, VALUE_ERROR = range(3)
+
+# The node sent for keys that are not in the ring.
+MISSING = -1 << 63
+
+_HEADER = struct.Struct('<IBII')
+
+# Map of error statuses to the exception raised by the client.
+_ERRORS = {KEY_ERROR: KeyError, VALUE_ERROR: ValueError}
+
+# Bytes of replies buffered before the server waits for a client to read them.
+_HIGH_WATER = 1 << 20
+
+
+def encode_keys(keys):
+    """
+    Encodes keys as a request payload.
+    Args:
+        keys (list): The str keys, without NUL characters.
+    Returns:
+        bytes: The payload.
+    """
+    payload = '\0'.join(keys).encode()
+    if payload.count(b'\0') != max(len(keys) - 1, 0):
+        raise ValueError("Keys must not contain NUL characters.")
+    return payload
+
+
+def decode_keys(payload, count):
+    """
+    Decodes the keys of a request payload.
+    Args:
+        payload (bytes): The payload, see encode_keys.
+        count (int): The number of keys.
+    Returns:
+        list: The keys.
+    """
+    if not count:
+        return []
+    keys = payload.decode().split('\0')
+    if len(keys) != count:
+        raise ValueError("Key count does not match the payload.")
+    return keys
+
+
+class RingServer:
+    def __init__(self, ring, address):
+        """
+        Initializes the RingServer object.
+        Args:
+            ring (SelfBalancingRing): The ring to serve. Its nodes must be int.
+            address: A Unix socket path, or a (host, port) pair for TCP. Port 0 picks a free port.
+        """
+        self.ring = ring
+        self.address = address
+        self._server = None
+
+    async def start(self):
+        """
+        Starts listening. Once started, address holds the bound address.
+        """
+        if isinstance(self.address, str):
+            self._server = await asyncio.start_unix_server(self._serve, self.address)
+        else:
+            self._server = await asyncio.start_server(self._serve, *self.address)
+            self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """
+        Starts listening if needed and serves clients until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        """
+        Stops listening.
+        """
+        if self._server is not None:
+            self._server.close()
+
+    async def _serve(self, reader, writer):
+        """
+        Answers the requests of a connection in order, until the client disconnects.
+        """
+        if writer.get_extra_info('socket').family != socket.AF_UNIX:
+            writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                request_id, opcode, count, length = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                payload = await reader.readexactly(length) if length else b''
+                try:
+                    status, count, reply = OK, count, self._handle(opcode, count, payload)
+                except KeyError as error:
+                    status, count, reply = KEY_ERROR, 0, str(error.args[0] if error.args else error).encode()
+                except (ValueError, TypeError) as error:
+                    status, count, reply = VALUE_ERROR, 0, str(error).encode()
+                writer.write(_HEADER.pack(request_id, status, count, len(reply)) + reply)
+                if writer.transport.get_write_buffer_size() > _HIGH_WATER:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _handle(self, opcode, count, payload):
+        """
+        Applies a request to the ring.
+        Returns:
+            bytes: The reply payload.
+        """
+        ring = self.ring
+        if opcode == LOOKUP:
+            keys = decode_keys(payload, count)
+            return array('q', map(ring.keys.get, keys, repeat(MISSING, count))).tobytes()
+        if opcode == INSERT:
+            ring.insert_keys(decode_keys(payload, count))
+            return b''
+        if opcode == REMOVE:
+            ring.remove_keys(decode_keys(payload, count))
+            return b''
+        if opcode == INSERT_KEY:
+            for key in decode_keys(payload, count):
+                ring.insert_key(key)
+            return b''
+        if opcode == REMOVE_KEY:
+            for key in decode_keys(payload, count):
+                ring.remove_key(key)
+            return b''
+        if opcode == REMAP:
+            nodes = array('q', payload[:8 * count])
+            keys = decode_keys(payload[8 * count:], count)
+            if any(node not in ring.nodes for node in nodes):
+                raise ValueError("Node not found in the ring.")
+            if any(key not in ring.keys for key in keys):
+                raise KeyError("Key not found in the ring.")
+            for key, node in zip(keys, nodes):
+                ring.remap(key, node)
+            return b''
+        raise ValueError(f"Unknown opcode {opcode}.")
+
+
+class RingClient:
+    def __init__(self, address, pool_size=4, batch_size=4096, window=16, timeout=None):
+        """
+        Initializes the RingClient object. Connections are opened on first use. The client can
+        be shared between threads, each request borrowing a connection from the pool.
+        Args:
+            address: The server's Unix socket path or (host, port) pair.
+            pool_size (int): The number of connections kept open at most.
+            batch_size (int): The number of keys sent per request by the *_many methods.
+            window (int): The number of requests sent on a connection before waiting for replies.
+            timeout (float): The socket timeout in seconds, None to block.
+        """
+        self.address = address
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.window = window
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()  # Connections not in use, as (socket, reader) pairs
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def lookup(self, key):
+        """
+        Retrieves the node responsible for a key.
+        Args:
+            key (str): The key.
+        Returns:
+            int: The node responsible for the key.
+        """
+        node = self.lookup_many([key])[0]
+        if node is None:
+            raise KeyError("Key not found in the ring.")
+        return node
+
+    def lookup_many(self, keys):
+        """
+        Retrieves the nodes responsible for many keys, in pipelined batches.
+        Args:
+            keys (iterable): The str keys.
+        Returns:
+            list: The node of each key, None for keys that are not in the ring.
+        """
+        keys = list(keys)
+        nodes = []
+        for _, payload in self._pipeline(LOOKUP, keys):
+            nodes.extend(array('q', payload))
+        if MISSING in nodes:
+            nodes = [None if node == MISSING else node for node in nodes]
+        return nodes
+
+    def insert_key(self, key):
+        """
+        Inserts a key, see SelfBalancingRing.insert_key.
+        """
+        self._pipeline(INSERT_KEY, [key])
+
+    def insert_keys(self, keys):
+        """
+        Inserts many keys, each batch with SelfBalancingRing.insert_keys. Batches are applied in
+        order. After a batch fails no more are sent, but those already in flight, up to window - 1,
+        are still applied.
+        """
+        self._pipeline(INSERT, list(keys))
+
+    def remove_key(self, key):
+        """
+        Removes a key, see SelfBalancingRing.remove_key.
+        """
+        self._pipeline(REMOVE_KEY, [key])
+
+    def remove_keys(self, keys):
+        """
+        Removes many keys, each batch with SelfBalancingRing.remove_keys. Batches are applied in
+        order. After a batch fails no more are sent, but those already in flight, up to window - 1,
+        are still applied.
+        """
+        self._pipeline(REMOVE, list(keys))
+
+    def remap(self, key, node):
+        """
+        Remaps a key to a specific node, see SelfBalancingRing.remap.
+        """
+        self._pipeline(REMAP, [key], [node])
+
+    def close(self):
+        """
+        Closes the idle connections.
+        """
+        while True:
+            try:
+                connection, reader = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            reader.close()
+            connection.close()
+            with self._lock:
+                self._opened -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _pipeline(self, opcode, keys, nodes=None):
+        """
+        Sends keys in batches on one connection, keeping up to window requests in flight, and stops
+        sending once a batch fails.
+        Returns:
+            list: The (count, payload) replies, in request order.
+        Raises:
+            KeyError, ValueError: The error of the first failed batch, once the replies in flight are read.
+        """
+        requests, sizes = [], []
+        for start in range(0, len(keys), self.batch_size) or [0]:
+            batch = keys[start:start + self.batch_size]
+            payload = encode_keys(batch)
+            if nodes is not None:
+                payload = array('q', nodes[start:start + self.batch_size]).tobytes() + payload
+            requests.append(_HEADER.pack(self._request_id(), opcode, len(batch), len(payload)) + payload)
+            sizes.append(_HEADER.size + (8 * len(batch) if opcode == LOOKUP else 0))
+
+        connection, reader = self._acquire()
+        replies, error = [], None
+        try:
+            sent = pending = 0
+            while len(replies) < len(requests):
+                # Keep the window full, then read the oldest reply. The replies in flight must fit
+                # under the server's high water mark: a server waiting for us to read would stop
+                # reading our requests, and sendall would block forever.
+                end = sent
+                while (error is None and end < len(requests) and end < len(replies) + self.window
+                       and (end == len(replies) or pending + sizes[end] <= _HIGH_WATER)):
+                    pending += sizes[end]
+                    end += 1
+                if end > sent:
+                    connection.sendall(b''.join(requests[sent:end]))
+                    sent = end
+                if len(replies) == sent:
+                    break  # A batch failed and every reply in flight is read
+                _, status, count, length = _HEADER.unpack(_read(reader, _HEADER.size))
+                pending -= sizes[len(replies)]
+                payload = _read(reader, length)
+                if status != OK and error is None:
+                    error = _ERRORS.get(status, ValueError)(payload.decode())
+                replies.append((count, payload))
+        except BaseException:
+            reader.close()
+            connection.close()  # The connection may hold unread replies
+            with self._lock:
+                self._opened -= 1
+            raise
+        self._idle.put((connection, reader))
+        if error is not None:
+            raise error
+        return replies
+
+    def _acquire(self):
+        """
+        Borrows an idle connection, opens a new one while under pool_size, or waits for one.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            opening = self._opened < self.pool_size
+            if opening:
+                self._opened += 1
+        if not opening:
+            return self._idle.get()
+        try:
+            if isinstance(self.address, str):
+                connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            else:
+                connection = socket.socket(socket.AF_INET6 if ':' in self.address[0] else socket.AF_INET)
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection.settimeout(self.timeout)
+            connection.connect(self.address)
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+        return connection, connection.makefile('rb')
+
+    def _request_id(self):
+        with self._lock:
+            self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+            return self._next_id
+
+
+def _read(reader, size):
+    """
+    Reads exactly size bytes from a connection.
+    """
+    data = reader.read(size) if size else b''
+    if len(data) != size:
+        raise ConnectionError("The ring server closed the connection.")
+    return data
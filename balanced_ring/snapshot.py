@@ -0,0 +1,181 @@
+import threading
+from contextlib import contextmanager
+
+'''
+The ConcurrentRing makes a SelfBalancingRing safe to share between threads. Writers serialize on a
+lock, change the ring and then publish a new immutable RoutingSnapshot of the key to node map.
+Readers resolve lookups against whichever snapshot is current, without taking any lock. Snapshots
+are split into shards by key hash and copied on write, so publishing a change copies only the shards
+holding the keys that changed, not the whole map.
+'''
+class RoutingSnapshot:
+
+    __slots__ = ('shards', 'mask', 'nodes', 'version')
+
+    def __init__(self, shards, nodes, version):
+        """
+        Initializes the RoutingSnapshot object. Its shards must not be changed afterwards.
+        Args:
+            shards (tuple): Dicts of keys to nodes, indexed by hash(key) & (len(shards) - 1).
+            nodes (tuple): The nodes of the ring.
+            version (int): The number of snapshots published before this one.
+        """
+        self.shards = shards
+        self.mask = len(shards) - 1
+        self.nodes = nodes
+        self.version = version
+
+    def lookup(self, key):
+        """
+        Retrieves the node responsible for a key.
+        Args:
+            key: The key to look up.
+        Returns:
+            int: The node responsible for the key.
+        """
+        try:
+            return self.shards[hash(key) & self.mask][key]
+        except KeyError:
+            raise KeyError("Key not found in the ring.") from None
+
+    def __contains__(self, key):
+        return key in self.shards[hash(key) & self.mask]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+class ConcurrentRing:
+
+    def __init__(self, ring, shards=1024):
+        """
+        Initializes the ConcurrentRing object.
+        Args:
+            ring (SelfBalancingRing): The ring to share. It must only be changed through this object.
+            shards (int): The number of snapshot shards, rounded up to a power of two.
+        """
+        self.ring = ring
+        self._lock = threading.Lock()
+
+        count = 1 << max(shards - 1, 0).bit_length()
+        partitions = [{} for _ in range(count)]
+        for key, node in ring.keys.items():
+            partitions[hash(key) & (count - 1)][key] = node
+        self.snapshot = RoutingSnapshot(tuple(partitions), tuple(ring.ring), 0)
+
+    def lookup(self, key):
+        """
+        Retrieves the node responsible for a key from the current snapshot, without locking.
+        Args:
+            key: The key to look up.
+        Returns:
+            int: The node responsible for the key.
+        """
+        return self.snapshot.lookup(key)
+
+    def insert_key(self, key):
+        """
+        Inserts a key, see SelfBalancingRing.insert_key.
+        """
+        with self._write():
+            self.ring.insert_key(key)
+
+    def remove_key(self, key):
+        """
+        Removes a key, see SelfBalancingRing.remove_key.
+        """
+        with self._write():
+            self.ring.remove_key(key)
+
+    def remap(self, key, node):
+        """
+        Remaps a key to a node, see SelfBalancingRing.remap.
+        """
+        with self._write():
+            self.ring.remap(key, node)
+
+    def insert_keys(self, keys):
+        """
+        Inserts many keys, see SelfBalancingRing.insert_keys.
+        """
+        with self._write():
+            self.ring.insert_keys(keys)
+
+    def remove_keys(self, keys):
+        """
+        Removes many keys, see SelfBalancingRing.remove_keys.
+        """
+        with self._write():
+            self.ring.remove_keys(keys)
+
+    def insert_node(self, node, dry_run=False, weight=1):
+        """
+        Inserts a node, see SelfBalancingRing.insert_node.
+        """
+        with self._write():
+            return self.ring.insert_node(node, dry_run, weight)
+
+    def remove_node(self, node, dry_run=False):
+        """
+        Removes a node, see SelfBalancingRing.remove_node.
+        """
+        with self._write():
+            return self.ring.remove_node(node, dry_run)
+
+    def set_weight(self, node, weight, dry_run=False):
+        """
+        Changes the weight of a node, see SelfBalancingRing.set_weight.
+        """
+        with self._write():
+            return self.ring.set_weight(node, weight, dry_run)
+
+    def apply_migration(self, plan):
+        """
+        Applies a MigrationPlan, see SelfBalancingRing.apply_migration.
+        """
+        with self._write():
+            self.ring.apply_migration(plan)
+
+    def run(self, change):
+        """
+        Runs a change of the ring that the other methods do not cover, such as a HotKeyTracker
+        rebalance, under the writer lock, and publishes all of it in one snapshot.
+        Args:
+            change (callable): Called with the SelfBalancingRing to change.
+        Returns:
+            The result of change.
+        """
+        with self._write():
+            return change(self.ring)
+
+    @contextmanager
+    def _write(self):
+        """
+        Runs a change of the ring under the writer lock and publishes the resulting snapshot,
+        also when the change fails halfway.
+        """
+        with self._lock:
+            self.ring.journal = set()
+            try:
+                yield
+            finally:
+                changed, self.ring.journal = self.ring.journal, None
+                self._publish(changed)
+
+    def _publish(self, changed):
+        """
+        Publishes a snapshot in which the shards holding changed keys are replaced by updated copies.
+        """
+        current = self.snapshot
+        shards = list(current.shards)
+        copied = {}
+        for key in changed:
+            index = hash(key) & current.mask
+            if index not in copied:
+                copied[index] = shards[index] = dict(shards[index])
+            if key in self.ring.keys:
+                shards[index][key] = self.ring.keys[key]
+            else:
+                shards[index].pop(key, None)
+
+        # A single attribute assignment, so readers see either the old or the new snapshot
+        self.snapshot = RoutingSnapshot(tuple(shards), tuple(self.ring.ring), current.version + 1)
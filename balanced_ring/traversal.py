@@ -0,0 +1,155 @@
+"""
+Closed-form arithmetic for the (+k, +1, -k, +1) traversal.
+
+Every four steps of the pattern advance the traversal by exactly +2, so the total
+displacement of any number of steps can be computed directly instead of walked.
+
+Functions:
+    offset(steps, k): Net displacement of the first `steps` steps of the pattern.
+    displacement(start, stop, k): Net displacement of pattern steps start .. stop - 1.
+    period_length(n): Number of steps after which the traversal of a ring of size n repeats.
+    occurrences(n, index): The steps of a period at which the traversal visits an index.
+    period(n): One full period of the traversal as a cached NumPy array.
+    positions(n, start, length): The traversal indices of steps start .. start + length - 1.
+
+The NumPy functions import NumPy on first use, so the closed-form helpers stay dependency free.
+"""
+import math
+from functools import lru_cache
+
+# Number of ring sizes whose period is kept in memory.
+PERIOD_CACHE_SIZE = 64
+
+
+def offset(steps, k):
+    """
+    Calculates the net displacement of the first `steps` steps of the pattern.
+    Args:
+        steps (int): The number of pattern steps taken from step 0. May be negative.
+        k (int): The +k / -k jump of the pattern.
+    Returns:
+        int: The sum of pattern[t % 4] for t in range(steps), not reduced modulo the ring size.
+    """
+    partial = (0, k, k + 1, 1)  # Displacement after 0, 1, 2 and 3 steps of a period.
+    return 2 * (steps // 4) + partial[steps % 4]
+
+
+def displacement(start, stop, k):
+    """
+    Calculates the net displacement of the pattern steps start, start + 1, ..., stop - 1.
+    Args:
+        start (int): The first step index.
+        stop (int): The step index to stop before.
+        k (int): The +k / -k jump of the pattern.
+    Returns:
+        int: The displacement, not reduced modulo the ring size.
+    """
+    return offset(stop, k) - offset(start, k)
+
+
+def period_length(n):
+    """
+    Calculates the number of steps after which the traversal of a ring of size n repeats.
+    Args:
+        n (int): The size of the circular array.
+    Returns:
+        int: The period length, 4n / gcd(n, 2).
+    """
+    # Each 4 steps advance by +2, so the pattern returns to 0 after n / gcd(n, 2) periods of 4.
+    return 4 * n // math.gcd(n, 2)
+
+
+def occurrences(n, index):
+    """
+    Calculates the steps of the first period at which the traversal visits an index.
+    Args:
+        n (int): The size of the circular array.
+        index (int): The visited index.
+    Returns:
+        list: The steps, 4 of them for odd n and 2 for even n.
+    """
+    k = math.ceil(n / 2)
+    steps = []
+    # Step 4q + r visits 2q + partial[r], so solve 2q = index - partial[r] (mod n) for q < period / 4
+    for r, partial in enumerate((0, k, k + 1, 1)):
+        target = (index - partial) % n
+        if n % 2:
+            q = target * pow(2, -1, n) % n
+        elif target % 2 == 0:
+            q = target // 2
+        else:
+            continue
+        steps.append(4 * q + r)
+    return sorted(steps)
+
+
+def _mirror_center(n):
+    """
+    Finds the step c for which step c - t visits (n - 1) - (the index visited at step t).
+    This is the reflect / reverse involution of sequence.py expressed as a step offset.
+    """
+    if n % 2 == 0:
+        return 2 * n - 1
+    # For odd n, c = 4m + 1 with 2m + k = n - 1 (mod n)
+    m = ((n - 3) // 2 * pow(2, -1, n)) % n
+    return 4 * m + 1
+
+
+@lru_cache(maxsize=PERIOD_CACHE_SIZE)
+def period(n):
+    """
+    Calculates one full period of the traversal of a ring of size n, starting at step 0.
+    Only half of the period is computed, the other half is its reflection and reversal.
+    Args:
+        n (int): The size of the circular array.
+    Returns:
+        numpy.ndarray: A read-only array of period_length(n) indices.
+    """
+    import numpy as np
+
+    k = math.ceil(n / 2)
+    length = period_length(n)
+    half = length // 2
+    # The half starting at (c + 1) / 2 reflects and reverses onto the other half.
+    start = (_mirror_center(n) + 1) // 2
+
+    steps = np.arange(start, start + half)
+    partial = np.array([0, k, k + 1, 1])
+    first = (2 * (steps // 4) + partial[steps % 4]) % n
+
+    result = np.empty(length, dtype=np.intp)
+    result[:half] = first
+    result[half:] = (n - 1) - first[::-1]  # reflect(reverse(first))
+    result = np.roll(result, start)  # Rotate so that the period begins at step 0.
+    result.flags.writeable = False
+    return result
+
+
+def positions(n, start, length):
+    """
+    Generates the traversal indices of steps start .. start + length - 1 by tiling the period.
+    Args:
+        n (int): The size of the circular array.
+        start (int): The first step to generate.
+        length (int): The number of steps to generate.
+    Returns:
+        numpy.ndarray: The traversal indices.
+    """
+    import numpy as np
+
+    cycle = period(n)
+    size = len(cycle)
+    shift = start % size
+
+    result = np.empty(length, dtype=np.intp)
+    head = min(size - shift, length)
+    result[:head] = cycle[shift:shift + head]
+    result[head:min(size, length)] = cycle[:min(size, length) - head]
+
+    # Double the filled prefix until the whole array is covered.
+    filled = min(size, length)
+    while filled < length:
+        count = min(filled, length - filled)
+        result[filled:filled + count] = result[:count]
+        filled += count
+    return result
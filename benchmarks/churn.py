@@ -0,0 +1,254 @@
+"""
+Seeded churn simulator and parameter sweep for SelfBalancingRing and BalancedRing.
+
+Each run replays a reproducible join / leave / move / lookup workload (the same mix as
+tests/example.py), plus explicit node joins and leaves for SelfBalancingRing, and records
+throughput, latency percentiles, keys moved per topology change and the spread of node loads. Sweeps over upper_bound, lower_bound, variance_factor and node
+counts are spread over a process pool and written as JSON, to compare results between releases.
+
+    python benchmarks/churn.py --operations 20000 --workers 4 --output results.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.instrumentation import Histogram, Instrumentation
+from balanced_ring.ring import BalancedRing
+from balanced_ring.self_balancing import SelfBalancingRing
+
+# Relative frequency of each operation in the churn workload.
+MIX = {'join': 3, 'leave': 3, 'move': 2, 'lookup': 2}
+
+# The SelfBalancingRing workload also adds and removes nodes, about once per 100 operations each.
+NODE_MIX = {**MIX, 'add_node': 0.1, 'remove_node': 0.1}
+
+# Percentiles reported for every timed operation.
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def workload(seed, operations, mix=MIX):
+    """
+    Generates a reproducible sequence of operation names.
+    Args:
+        seed (int): The random seed.
+        operations (int): The number of operations.
+        mix (dict): Relative frequency of each operation.
+    Yields:
+        str: The operation names.
+    """
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    for _ in range(operations):
+        yield rng.choices(names, weights)[0]
+
+
+def derive_seed(seed, stream):
+    """
+    Derives the seed of one random stream of a run from its base seed, so that the operation
+    sequence and the choices made within operations are independent of each other.
+    Args:
+        seed (int): The base seed of the run.
+        stream (str): The name of the stream.
+    Returns:
+        int: The derived seed.
+    """
+    return random.Random(f'{seed}:{stream}').getrandbits(64)
+
+
+def summarize(histogram):
+    """
+    Summarizes a Histogram as a count, a mean and percentiles, in microseconds.
+    """
+    summary = {'count': histogram.count, 'mean_us': histogram.total / max(histogram.count, 1) * 1e6}
+    for q in PERCENTILES:
+        summary[f'p{q}_us'] = histogram.percentile(q) * 1e6
+    return summary
+
+
+def run_self_balancing(config):
+    """
+    Runs the churn workload against a SelfBalancingRing.
+    Args:
+        config (dict): nodes, upper_bound, lower_bound, variance_factor, preload, operations and seed.
+    Returns:
+        dict: The config and its measurements.
+    """
+    rng = random.Random(derive_seed(config['seed'], 'choices'))
+    ring = SelfBalancingRing(list(range(config['nodes'])), config['upper_bound'],
+                             config['lower_bound'], config['variance_factor'])
+    metrics = Instrumentation()
+    metrics.attach(ring)
+
+    live = []  # Keys in the ring, for O(1) random choice
+    position = {}
+    serial = itertools.count()
+
+    def join():
+        key = f'key{next(serial)}'
+        ring.insert_key(key)
+        position[key] = len(live)
+        live.append(key)
+
+    def leave(key):
+        ring.remove_key(key)
+        index = position.pop(key)
+        last = live.pop()
+        if last != key:
+            live[index] = last
+            position[last] = index
+
+    for _ in range(config['preload']):
+        join()
+
+    spreads = []
+    start = time.perf_counter()
+    for operation in workload(derive_seed(config['seed'], 'operations'), config['operations'], NODE_MIX):
+        if operation == 'add_node':
+            ring.insert_node(max(ring.ring, default=-1) + 1)
+        elif operation == 'remove_node' and len(ring.ring) > 1:
+            ring.remove_node(rng.choice(ring.ring))
+        elif operation == 'join' or not live:
+            join()
+        elif operation == 'leave':
+            leave(rng.choice(live))
+        elif operation == 'move':
+            key = rng.choice(live)
+            node = rng.choice(ring.ring)
+            if node != ring.keys[key] and len(ring.nodes[node]) < ring.upper_bound:
+                ring.remap(key, node)
+        else:
+            ring.lookup(rng.choice(live))
+        if len(spreads) < 1000 and rng.random() < 0.01:
+            spreads.append(_spread(ring))
+    elapsed = time.perf_counter() - start
+
+    counters = metrics.counters
+    changes = counters.get('nodes_joined', 0) + counters.get('nodes_left', 0)
+    return {
+        'ring': 'SelfBalancingRing',
+        'config': config,
+        'ops_per_sec': config['operations'] / elapsed,
+        'latency': {operation: summarize(histogram) for operation, histogram in metrics.timings.items()},
+        'topology_changes': changes,
+        'keys_moved': counters.get('keys_moved', 0),
+        'keys_moved_per_change': counters.get('keys_moved', 0) / changes if changes else 0.0,
+        'final_nodes': len(ring.ring),
+        'final_keys': len(ring.keys),
+        'final_spread': _spread(ring),
+        'mean_spread': sum(spreads) / len(spreads) if spreads else 0.0,
+    }
+
+
+def run_balanced(config):
+    """
+    Runs an insert / remove / lookup churn against a BalancedRing used as a slot allocator.
+    Args:
+        config (dict): size, operations and seed.
+    Returns:
+        dict: The config and its measurements.
+    """
+    rng = random.Random(derive_seed(config['seed'], 'choices'))
+    ring = BalancedRing(config['size'])
+    timings = {operation: Histogram() for operation in ('insert', 'remove', 'lookup')}
+    live = []
+
+    start = time.perf_counter()
+    for operation in workload(derive_seed(config['seed'], 'operations'), config['operations']):
+        if (operation == 'join' and len(live) < ring.size) or not live:
+            key = len(live) + rng.random()
+            began = time.perf_counter()
+            ring.insert(key, None)
+            timings['insert'].record(time.perf_counter() - began)
+            live.append(key)
+        elif operation in ('leave', 'join'):
+            index = rng.randrange(len(live))
+            live[index], live[-1] = live[-1], live[index]
+            began = time.perf_counter()
+            ring.remove(live.pop())
+            timings['remove'].record(time.perf_counter() - began)
+        else:
+            key = rng.choice(live)
+            began = time.perf_counter()
+            ring.lookup(key)
+            timings['lookup'].record(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'ring': 'BalancedRing',
+        'config': config,
+        'ops_per_sec': config['operations'] / elapsed,
+        'latency': {operation: summarize(histogram) for operation, histogram in timings.items()},
+        'final_keys': len(live),
+    }
+
+
+def _spread(ring):
+    sizes = [len(keys) for keys in ring.nodes.values()]
+    return max(sizes) - min(sizes) if sizes else 0
+
+
+def sweep(args):
+    """
+    Builds the run configurations of a sweep.
+    """
+    configs = []
+    for nodes, upper_bound, lower_bound, variance_factor in itertools.product(
+            args.nodes, args.upper_bound, args.lower_bound, args.variance_factor):
+        if lower_bound >= upper_bound:
+            continue
+        configs.append((run_self_balancing, {
+            'nodes': nodes, 'upper_bound': upper_bound, 'lower_bound': lower_bound,
+            'variance_factor': variance_factor, 'preload': nodes * upper_bound // 2,
+            'operations': args.operations, 'seed': args.seed,
+        }))
+    for size in args.sizes:
+        configs.append((run_balanced, {'size': size, 'operations': args.operations, 'seed': args.seed}))
+    return configs
+
+
+def _run(job):
+    runner, config = job
+    return runner(config)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--operations', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--nodes', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--upper-bound', type=int, nargs='+', default=[35, 100])
+    parser.add_argument('--lower-bound', type=int, nargs='+', default=[0, 5])
+    parser.add_argument('--variance-factor', type=int, nargs='+', default=[1, 2, 5])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1024, 65536], help='BalancedRing sizes')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', help='JSON file to write, stdout if omitted')
+    args = parser.parse_args(argv)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(_run, sweep(args)))
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'arguments': vars(args),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
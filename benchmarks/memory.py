@@ -0,0 +1,77 @@
+"""
+Memory per entry of BalancedRing against CompactBalancedRing.
+
+Fills every slot of a ring of the given size with integer keys and separate integer values, and
+reports the bytes per entry two ways: the growth of the process's resident set size (RSS), and the
+bytes allocated as traced by tracemalloc, both including the key and value objects. Each layout is
+measured in a fresh process, since RSS does not shrink back once freed.
+
+    python benchmarks/memory.py [size]
+"""
+import multiprocessing
+import os
+import resource
+import sys
+import tracemalloc
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.compact import CompactBalancedRing
+from balanced_ring.ring import BalancedRing
+
+LAYOUTS = {
+    'BalancedRing': BalancedRing,
+    'CompactBalancedRing': CompactBalancedRing,
+    "CompactBalancedRing('q')": lambda size: CompactBalancedRing(size, value_type='q'),
+    "CompactBalancedRing('q', 'q')": lambda size: CompactBalancedRing(size, value_type='q', key_type='q'),
+}
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+def peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+
+def fill(factory, size):
+    ring = factory(size)
+    for key in range(10 ** 9, 10 ** 9 + size):
+        ring.insert(key, key * 3)  # A distinct value object per entry
+    return ring
+
+
+def measure(name, size, results):
+    """
+    Fills a ring once under RSS accounting and once under tracemalloc, and reports the bytes per
+    entry of each. Tracing slows allocation down and adds its own memory, so the two do not share a run.
+    """
+    start = peak_rss()
+    ring = fill(LAYOUTS[name], size)
+    rss = (peak_rss() - start) / size
+    del ring
+
+    tracemalloc.start()
+    ring = fill(LAYOUTS[name], size)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results.put((rss, allocated / size))
+
+
+def main(size):
+    results = multiprocessing.Queue()
+    baseline = None
+    print(f"{'':31} {'RSS':>25}  {'tracemalloc':>25}")
+    for name in LAYOUTS:
+        process = multiprocessing.Process(target=measure, args=(name, size, results))
+        process.start()
+        rss, traced = results.get()
+        process.join()
+        baseline = baseline or (rss, traced)
+        print(f"{name:31} {rss:8.1f} bytes/entry {baseline[0] / rss:4.1f}x"
+              f"  {traced:8.1f} bytes/entry {baseline[1] / traced:4.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,58 @@
+"""
+Restart time from a snapshot against rebuilding a SelfBalancingRing from its keys.
+
+Builds a ring of the given number of keys, saves a snapshot and reports how long it takes to map it
+and serve the first lookup, the lookup rate from the mapped file, a full restore, and a rebuild by
+inserting every key again.
+
+    python benchmarks/restart.py [keys]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.persistence import load_snapshot, save_snapshot
+from balanced_ring.self_balancing import SelfBalancingRing
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(count):
+    keys = [f'user:{i}:session' for i in range(count)]
+    ring = SelfBalancingRing(list(range(64)), upper_bound=count // 32 + 1, lower_bound=0, variance_factor=2)
+    ring.insert_keys(keys)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'ring.snapshot')
+        _, save = timed(save_snapshot, ring, path)
+        print(f'save:           {save * 1e3:9.1f} ms  ({os.path.getsize(path) / count:.1f} bytes/key)')
+
+        start = time.perf_counter()
+        mapped = load_snapshot(path)
+        mapped.lookup(keys[count // 2])
+        print(f'first lookup:   {(time.perf_counter() - start) * 1e3:9.3f} ms after open')
+
+        sample = random.Random(0).sample(keys, min(count, 100000))
+        _, elapsed = timed(lambda: [mapped.lookup(key) for key in sample])
+        print(f'mapped lookups: {len(sample) / elapsed:9.0f} /s')
+
+        _, restore = timed(mapped.restore)
+        print(f'restore:        {restore * 1e3:9.1f} ms')
+        mapped.close()
+
+    rebuilt = SelfBalancingRing(list(range(64)), upper_bound=count // 32 + 1, lower_bound=0, variance_factor=2)
+    _, rebuild = timed(lambda: [rebuilt.insert_key(key) for key in keys])
+    print(f'insert_key:     {rebuild * 1e3:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
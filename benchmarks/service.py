@@ -0,0 +1,68 @@
+"""
+Lookup throughput of a RingServer over loopback.
+
+Starts a server in a separate process with a ring of the given number of keys, then looks all the
+keys up through a RingClient in pipelined batches, over a Unix socket and over TCP, and reports the
+lookups per second for a few batch sizes.
+
+    python benchmarks/service.py [keys]
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+from balanced_ring.service import RingClient, RingServer
+
+BATCH_SIZES = (256, 4096, 16384)
+
+
+def keys(count):
+    return [f'user:{i}:session' for i in range(count)]
+
+
+def serve(address, count, ready):
+    async def main():
+        ring = SelfBalancingRing(list(range(64)), upper_bound=count // 32 + 1, lower_bound=0, variance_factor=2)
+        ring.insert_keys(keys(count))
+        server = RingServer(ring, address)
+        await server.start()
+        ready.put(server.address)
+        await server.serve_forever()
+    asyncio.run(main())
+
+
+def measure(name, address, count):
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(address, count, ready), daemon=True)
+    process.start()
+    address = ready.get()
+    try:
+        lookups = keys(count)
+        for batch_size in BATCH_SIZES:
+            with RingClient(address, pool_size=1, batch_size=batch_size) as client:
+                client.lookup_many(lookups[:batch_size])  # Connect and warm up
+                start = time.perf_counter()
+                nodes = client.lookup_many(lookups)
+                elapsed = time.perf_counter() - start
+            assert None not in nodes
+            print(f'{name:5} batch {batch_size:6}: {count / elapsed:11.0f} lookups/s')
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as directory:
+        measure('unix', os.path.join(directory, 'ring.sock'), count)
+    measure('tcp', ('127.0.0.1', 0), count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
@@ -0,0 +1,64 @@
+"""
+Request load per node under a Zipf workload, with and without hot key rebalancing.
+
+Looks up keys drawn from a Zipf distribution and reports the busiest node's share of requests
+against the average (1.0 is perfectly even), without rebalancing and with a HotKeyTracker
+rebalancing every `interval` lookups, along with the lookup rate in both cases.
+
+    python benchmarks/zipf.py [lookups] [exponent]
+"""
+import os
+import random
+import sys
+import time
+from collections import Counter
+from itertools import accumulate
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.hot_keys import HotKeyTracker
+from balanced_ring.self_balancing import SelfBalancingRing
+
+KEYS = 100000
+NODES = 32
+
+
+def workload(lookups, exponent, seed=0):
+    rng = random.Random(seed)
+    keys = [f'key{i}' for i in range(KEYS)]
+    ranked = rng.sample(keys, KEYS)  # Spread the popular ranks over the nodes
+    weights = list(accumulate(1 / rank ** exponent for rank in range(1, KEYS + 1)))
+    return keys, rng.choices(ranked, cum_weights=weights, k=lookups)
+
+
+def run(keys, requests, interval):
+    ring = SelfBalancingRing(list(range(NODES)), upper_bound=2 * KEYS // NODES, lower_bound=0, variance_factor=2)
+    ring.insert_keys(keys)
+    tracker = HotKeyTracker(half_life=len(requests) // 4, rebalance_every=interval)
+    tracker.attach(ring)
+
+    # Measure the second half, once the tracker has seen the workload
+    half = len(requests) // 2
+    for key in requests[:half]:
+        ring.lookup(key)
+    served = dict.fromkeys(ring.nodes, 0)
+    start = time.perf_counter()
+    for key in requests[half:]:
+        served[ring.lookup(key)] += 1
+    elapsed = time.perf_counter() - start
+    imbalance = max(served.values()) / (sum(served.values()) / len(served))
+    return imbalance, (len(requests) - half) / elapsed
+
+
+def main(lookups, exponent):
+    keys, requests = workload(lookups, exponent)
+    hottest = max(Counter(requests[len(requests) // 2:]).values())
+    print(f'{"hottest key alone":24} {hottest / (len(requests) / 2 / NODES):18.2f}x average')
+    for name, interval in (('no rebalancing', None), ('rebalance every 10000', 10000)):
+        imbalance, rate = run(keys, requests, interval)
+        print(f'{name:24} busiest node {imbalance:5.2f}x average, {rate:9.0f} lookups/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6, float(sys.argv[2]) if len(sys.argv) > 2 else 1.1)
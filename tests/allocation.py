@@ -0,0 +1,72 @@
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.free_index import FreeIndex
+from balanced_ring.ring import BalancedRing
+
+class TestFreeSlotAllocation(unittest.TestCase):
+
+    def test_fills_in_traversal_order(self):
+        ring = BalancedRing(9)
+        order = []
+        for key in range(9):
+            ring.insert(key, key)
+            order.append(ring.keys[key])
+        self.assertEqual(sorted(order), list(range(9)))
+        self.assertEqual(order, list(dict.fromkeys(BalancedRing(9).traverse(40)[1:]))[:9])
+        with self.assertRaises(ValueError):
+            ring.insert(9, 9)
+
+    def test_never_overwrites(self):
+        random.seed(5)
+        for size in (1, 2, 7, 16):
+            ring = BalancedRing(size)
+            live = {}
+            for key in range(500):
+                if len(live) == size or (live and random.random() < 0.4):
+                    removed = random.choice(list(live))
+                    self.assertEqual(ring.remove(removed), live.pop(removed))
+                ring.insert(key, f'value{key}')
+                live[key] = f'value{key}'
+
+                self.assertEqual(len(set(ring.keys.values())), len(ring.keys))
+                self.assertEqual(sum(ring.occupied), len(live))
+                for k, value in live.items():
+                    self.assertEqual(ring.lookup(k), value)
+
+    def test_reuses_released_slot(self):
+        ring = BalancedRing(8)
+        for key in range(8):
+            ring.insert(key, key)
+        slot = ring.keys[3]
+        ring.remove(3)
+        self.assertEqual(ring.occupied[slot], 0)
+        ring.insert('new', 'value')
+        self.assertEqual(ring.keys['new'], slot)
+        self.assertEqual(ring.current, slot)
+        self.assertNotIn(0, ring.occupied)
+
+    def test_free_index_matches_set(self):
+        random.seed(11)
+        for length in (1, 63, 64, 65, 5000):
+            index = FreeIndex(length)
+            free = set(range(length))
+            for _ in range(3000):
+                position = random.randrange(length)
+                if random.random() < 0.6:
+                    index.discard(position)
+                    free.discard(position)
+                else:
+                    index.add(position)
+                    free.add(position)
+                start = random.randrange(length)
+                self.assertEqual(index.find(start), min((p for p in free if p >= start), default=-1))
+                self.assertEqual(position in index, position in free)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+
+class TestBulkOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SelfBalancingRing(list(range(5)), upper_bound=100, lower_bound=3, variance_factor=2)
+
+    def assertConsistent(self):
+        self.assertEqual(self.ring.load_index.loads, {node: len(keys) for node, keys in self.ring.nodes.items()})
+        self.assertEqual(sorted(self.ring.ring), sorted(self.ring.nodes))
+        for key, node in self.ring.keys.items():
+            self.assertIn(key, self.ring.nodes[node])
+
+    def test_insert_keys(self):
+        self.ring.insert_keys(f'key{i}' for i in range(1234))
+        sizes = [len(keys) for keys in self.ring.nodes.values()]
+        self.assertEqual(len(self.ring.ring), 13)
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+        self.assertLessEqual(max(sizes), self.ring.upper_bound)
+        self.assertConsistent()
+
+    def test_insert_keys_rejects_duplicates(self):
+        self.ring.insert_key('key0')
+        with self.assertRaises(ValueError):
+            self.ring.insert_keys(['key1', 'key0'])
+        with self.assertRaises(ValueError):
+            self.ring.insert_keys(['key1', 'key1'])
+        self.assertEqual(list(self.ring.keys), ['key0'])
+
+    def test_remove_keys(self):
+        self.ring.insert_keys(f'key{i}' for i in range(1234))
+        self.ring.remove_keys(f'key{i}' for i in range(1100))
+        self.assertEqual(len(self.ring.keys), 134)
+        for keys in self.ring.nodes.values():
+            self.assertGreaterEqual(len(keys), self.ring.lower_bound)
+            self.assertLessEqual(len(keys), self.ring.upper_bound)
+        self.assertConsistent()
+
+        with self.assertRaises(KeyError):
+            self.ring.remove_keys(['key0'])
+
+if __name__ == '__main__':
+    unittest.main()
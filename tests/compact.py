@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.compact import CompactBalancedRing
+from balanced_ring.ring import BalancedRing
+
+class TestCompactBalancedRing(unittest.TestCase):
+
+    def test_matches_balanced_ring(self):
+        for value_type, key_type in ((None, None), ('q', None), ('d', 'q')):
+            ring = BalancedRing(17)
+            compact = CompactBalancedRing(17, value_type=value_type, key_type=key_type)
+            for key in range(17):
+                ring.insert(key, key * 3)
+                compact.insert(key, key * 3)
+                self.assertEqual(compact.current, ring.current)
+            for key in range(17):
+                self.assertEqual(compact.lookup(key), ring.lookup(key))
+
+    def test_remove(self):
+        compact = CompactBalancedRing(8, value_type='q')
+        for key in range(8):
+            compact.insert(f'key{key}', key)
+        with self.assertRaises(ValueError):
+            compact.insert('key8', 8)
+        for key in range(0, 8, 2):
+            self.assertEqual(compact.remove(f'key{key}'), key)
+        for key in range(8, 12):
+            compact.insert(f'key{key}', key)
+        for key in [1, 3, 5, 7, 8, 9, 10, 11]:
+            self.assertEqual(compact.lookup(f'key{key}'), key)
+        with self.assertRaises(KeyError):
+            compact.lookup('key0')
+
+    def test_rejected_value_frees_slot(self):
+        compact = CompactBalancedRing(2, value_type='q')
+        with self.assertRaises(TypeError):
+            compact.insert('key', 'A')
+        compact.insert('key', 1)
+        compact.insert('other', 2)
+        self.assertEqual(compact.lookup('key'), 1)
+
+    def test_duplicate_key(self):
+        compact = CompactBalancedRing(4)
+        compact.insert('key', 'A')
+        with self.assertRaises(KeyError):
+            compact.insert('key', 'B')
+
+    def test_slots(self):
+        self.assertFalse(hasattr(BalancedRing(4), '__dict__'))
+        self.assertFalse(hasattr(CompactBalancedRing(4), '__dict__'))
+
+if __name__ == '__main__':
+    unittest.main()
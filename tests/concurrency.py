@@ -0,0 +1,90 @@
+import unittest
+import random
+import threading
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+from balanced_ring.snapshot import ConcurrentRing
+
+class TestConcurrentRing(unittest.TestCase):
+
+    def setUp(self):
+        ring = SelfBalancingRing(list(range(8)), upper_bound=60, lower_bound=5, variance_factor=2)
+        ring.insert_keys(f'stable{i}' for i in range(200))
+        self.ring = ConcurrentRing(ring, shards=16)
+
+    def test_snapshot_follows_writes(self):
+        self.ring.insert_key('key')
+        node = self.ring.lookup('key')
+        self.assertEqual(node, self.ring.ring.keys['key'])
+        other = next(n for n in self.ring.ring.nodes if n != node)
+        self.ring.remap('key', other)
+        self.assertEqual(self.ring.lookup('key'), other)
+        self.ring.remove_key('key')
+        with self.assertRaises(KeyError):
+            self.ring.lookup('key')
+
+    def test_failed_write_still_publishes(self):
+        before = self.ring.snapshot
+        with self.assertRaises(KeyError):
+            self.ring.remove_keys(['missing'])
+        self.assertEqual(self.ring.snapshot.version, before.version + 1)
+        self.assertEqual(self.ring.lookup('stable0'), self.ring.ring.keys['stable0'])
+
+    def test_readers_during_churn(self):
+        errors = []
+        stop = threading.Event()
+
+        def read():
+            stable = [f'stable{i}' for i in range(200)]
+            while not stop.is_set():
+                snapshot = self.ring.snapshot
+                for key in stable:
+                    try:
+                        node = snapshot.lookup(key)
+                    except KeyError:
+                        errors.append(f'{key} lost')
+                        return
+                    if node not in snapshot.nodes:
+                        errors.append(f'{key} routed to missing node {node}')
+                        return
+
+        def churn():
+            rng = random.Random(11)
+            for i in range(1500):
+                action = rng.random()
+                if action < 0.4:
+                    self.ring.insert_key(f'churn{i}')
+                elif action < 0.7:
+                    churned = [key for key in self.ring.ring.keys if key.startswith('churn')]
+                    if churned:
+                        self.ring.remove_key(rng.choice(churned))
+                elif action < 0.95:
+                    key = f'stable{rng.randrange(200)}'
+                    nodes = [n for n in self.ring.ring.nodes if len(self.ring.ring.nodes[n]) < 60]
+                    self.ring.remap(key, rng.choice(nodes))
+                elif action < 0.98:
+                    self.ring.insert_node(max(self.ring.ring.ring) + 1)
+                elif len(self.ring.ring.ring) > 2:
+                    self.ring.remove_node(rng.choice(self.ring.ring.ring))
+
+        readers = [threading.Thread(target=read) for _ in range(8)]
+        for thread in readers:
+            thread.start()
+        churn()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        snapshot = self.ring.snapshot
+        self.assertEqual(len(snapshot), len(self.ring.ring.keys))
+        for key, node in self.ring.ring.keys.items():
+            self.assertEqual(snapshot.lookup(key), node)
+
+if __name__ == '__main__':
+    unittest.main()
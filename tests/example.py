@@ -5,7 +5,7 @@ import os
 # Add the parent directory to the system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from SelfBalancingRing import SelfBalancingRing
+from balanced_ring.self_balancing import SelfBalancingRing
 
 # Example usage
 initial_nodes = list(range(3))  # Initialize with 10 nodes
@@ -22,7 +22,7 @@ for i in range(246):
 print("Current ring structure:", ring.ring)
 print("Current nodes and their keys:")
 for node, keys in ring.nodes.items():
-    print(f"Node {node}: {keys}")
+    print(f"Node {node}: {list(keys)}")
 
 # Simulate client movement by randomly removing and adding keys
 actions = ['join', 'leave', 'move']
@@ -56,7 +56,7 @@ print("\nAfter simulating client movement:")
 print("Current ring structure:", ring.ring)
 print("Current nodes and their keys:")
 for node, keys in ring.nodes.items():
-    print(f"Node {node}: {keys}")
+    print(f"Node {node}: {list(keys)}")
 
 # Insert a large number of keys
 for i in range(264):
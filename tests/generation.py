@@ -0,0 +1,88 @@
+import itertools
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.ring import BalancedRing
+from balanced_ring.sequence import Sequence, analyze
+from balanced_ring.traversal import period, period_length
+
+class TestVectorizedGeneration(unittest.TestCase):
+
+    def test_period_repeats(self):
+        for n in range(1, 40):
+            sequence, _ = Sequence(n).generate(2 * period_length(n))
+            self.assertEqual(list(period(n)), sequence[:period_length(n)])
+            self.assertEqual(sequence[:period_length(n)], sequence[period_length(n):])
+
+    def test_sequence_generate(self):
+        for n in (1, 2, 9, 17, 64):
+            for length in (0, 1, 7, 178, 1000):
+                expected = Sequence(n)
+                sequence, num_visits = expected.generate(length)
+                s = Sequence(n)
+                array, counts = s.generate(length, vectorized=True)
+                self.assertEqual(list(array), sequence)
+                self.assertEqual(list(counts), [num_visits[i] for i in range(n)])
+                self.assertEqual(s.next(), expected.next())
+
+    def test_balanced_ring_traverse(self):
+        for size in (1, 4, 9, 16):
+            expected = BalancedRing(size)
+            ring = BalancedRing(size)
+            for length in (0, 1, 20, 333):
+                self.assertEqual(list(ring.traverse(length, vectorized=True)), expected.traverse(length))
+                self.assertEqual((ring.current, ring.i), (expected.current, expected.i))
+
+class TestIterators(unittest.TestCase):
+
+    def test_iterators_keep_own_state(self):
+        ring = BalancedRing(9)
+        ring.seek(5)
+        forward = ring.iter_forward()
+        backward = ring.iter_backward(40)
+        first = list(itertools.islice(forward, 30))
+        last = list(itertools.islice(backward, 30))
+        self.assertEqual((ring.current, ring.i), (ring.position_at(5), 5))
+
+        self.assertEqual(first, BalancedRing(9).traverse(35)[5:])
+        self.assertEqual(last[::-1], BalancedRing(9).traverse(41)[11:])
+
+    def test_iter_chunks(self):
+        ring = BalancedRing(16)
+        chunks = list(ring.iter_chunks(7, start_step=3, length=50))
+        self.assertEqual([len(chunk) for chunk in chunks], [7] * 7 + [1])
+        self.assertEqual(list(itertools.chain(*chunks)), list(itertools.islice(ring.iter_forward(3), 50)))
+        self.assertEqual(ring.i, 0)
+
+class TestAnalyze(unittest.TestCase):
+
+    def test_matches_generated_traversal(self):
+        for n in (1, 2, 7, 12, 17):
+            for length in (0, 1, 40, 178, 1001):
+                sequence, num_visits = Sequence(n).generate(length)
+                result = analyze(n, length)
+                self.assertEqual(list(result['num_visits']), [num_visits[i] for i in range(n)])
+                self.assertEqual(result['spread'], max(num_visits.values()) - min(num_visits.values()))
+
+                visits = [0] * n
+                spreads = []
+                for index in sequence:
+                    spreads.append(max(visits) - min(visits))
+                    visits[index] += 1
+                spreads.append(max(visits) - min(visits))
+                profile = result['prefix_discrepancy']
+                self.assertEqual([profile[m % period_length(n)] for m in range(length)], spreads[:length])
+                self.assertEqual(result['worst_discrepancy'], max(spreads))
+                self.assertEqual(result['worst_prefix'], spreads.index(max(spreads)))
+
+    def test_huge_length(self):
+        result = analyze(1001, 10 ** 12)
+        self.assertEqual(int(result['num_visits'].sum()), 10 ** 12)
+        self.assertLessEqual(result['spread'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
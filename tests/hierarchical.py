@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.hierarchical import HierarchicalRing
+from balanced_ring.routing import _jump, home_index, key_hash
+
+class TestHierarchicalRing(unittest.TestCase):
+
+    def setUp(self):
+        groups = {f'rack{g}': list(range(4)) for g in range(8)}
+        self.ring = HierarchicalRing(groups, upper_bound=40, lower_bound=2, variance_factor=2)
+        for i in range(800):
+            self.ring.insert_key(f'key{i}')
+
+    def assertConsistent(self, ring=None, size=800):
+        ring = ring or self.ring
+        self.assertEqual(len(ring), size)
+        n = len(ring.groups)
+        for group, inner in ring.rings.items():
+            for key, node in inner.keys.items():
+                self.assertEqual(ring.lookup(key), (group, node))
+                # Only keys outside their home group are in the overflow table, and the index is current
+                home, jump = _jump(key_hash(key), n)
+                self.assertEqual(key in ring.overflow, group != ring.groups[home])
+                self.assertIn(key, ring._homes[home])
+                self.assertIn(key, ring._jumps[jump])
+        self.assertEqual(sum(map(len, ring._jumps.values())), size)
+
+    def test_lookup(self):
+        self.assertConsistent()
+        self.assertIn('key0', self.ring)
+        self.assertNotIn('missing', self.ring)
+        with self.assertRaises(KeyError):
+            self.ring.lookup('missing')
+        with self.assertRaises(ValueError):
+            self.ring.insert_key('key0')
+
+    def test_node_changes_stay_in_group(self):
+        others = {group: dict(ring.keys) for group, ring in self.ring.rings.items() if group != 'rack3'}
+        plan = self.ring.insert_node('rack3', 4)
+        self.assertTrue(all(destination == 4 for _, _, destination in plan.moves))
+        self.ring.remove_node('rack3', 0)
+        self.assertEqual(others, {group: ring.keys for group, ring in self.ring.rings.items() if group != 'rack3'})
+        self.assertConsistent()
+
+    def test_full_group_spills_over(self):
+        ring = HierarchicalRing({'a': [0], 'b': [0]}, upper_bound=5, lower_bound=0, variance_factor=1)
+        homed = [i for i in range(100) if home_index(key_hash(i), 2) == 0][:11]
+        for key in homed[:7]:
+            ring.insert_key(key)
+        self.assertEqual([len(ring.rings[group].keys) for group in ('a', 'b')], [5, 2])
+        self.assertEqual(len(ring.overflow), 2)
+        for key in homed[7:]:
+            ring.insert_key(key)
+        # Both groups are full, so the home group grows
+        self.assertEqual(len(ring.rings['a'].ring), 2)
+        self.assertEqual(len(ring.rings['b'].ring), 1)
+        for key in list(ring.overflow):
+            ring.remove_key(key)
+        self.assertFalse(ring.overflow)
+
+    def test_insert_group(self):
+        moves = self.ring.insert_group('rack8', [0, 1, 2, 3])
+        self.assertTrue(all(destination == 'rack8' for _, _, destination in moves))
+        self.assertLess(len(moves), 200)
+        self.assertConsistent()
+
+    def test_remove_group(self):
+        moves = self.ring.remove_group('rack2')
+        self.assertNotIn('rack2', self.ring.groups)
+        self.assertTrue(all(source in ('rack2', 'rack7') for _, source, _ in moves))
+        self.assertConsistent()
+        with self.assertRaises(ValueError):
+            self.ring.remove_group('rack2')
+
+    def test_group_changes_with_overflow(self):
+        groups = {f'rack{g}': [0] for g in range(5)}
+        ring = HierarchicalRing(groups, upper_bound=6, lower_bound=0, variance_factor=1, probes=3)
+        for i in range(40):
+            ring.insert_key(i)
+        self.assertTrue(ring.overflow)
+        size = 40
+        for group in ('rack1', 'rack4', 'rack0'):
+            size -= len(ring.rings[group].keys)
+            for key in list(ring.rings[group].keys):
+                ring.remove_key(key)
+            ring.remove_group(group)
+            self.assertConsistent(ring, size)
+        for g in range(5, 9):
+            ring.insert_group(f'rack{g}', [0])
+            self.assertConsistent(ring, size)
+        # Removing a group with keys places them again
+        ring.remove_group('rack2')
+        self.assertConsistent(ring, size)
+
+if __name__ == '__main__':
+    unittest.main()
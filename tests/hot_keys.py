@@ -0,0 +1,141 @@
+import threading
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+from balanced_ring.hot_keys import HotKeyTracker
+from balanced_ring.instrumentation import Instrumentation
+from balanced_ring.snapshot import ConcurrentRing
+
+class TestHotKeyTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SelfBalancingRing(list(range(4)), upper_bound=50, lower_bound=0, variance_factor=2)
+        self.ring.insert_keys(f'key{i}' for i in range(100))
+        self.tracker = HotKeyTracker(capacity=16, half_life=1000)
+        self.tracker.attach(self.ring)
+
+    def test_counts_decay(self):
+        for _ in range(500):
+            self.ring.lookup('key0')
+        self.assertAlmostEqual(self.tracker.estimate('key0'), 500)
+        for _ in range(1000):
+            self.ring.lookup('key1')
+        # Older accesses count half after each half life
+        self.assertLess(self.tracker.estimate('key0'), 300)
+        self.assertEqual(self.tracker.hottest(1)[0][0], 'key1')
+        self.assertGreaterEqual(self.tracker.node_load(self.ring.keys['key1']), self.tracker.estimate('key1'))
+
+    def test_memory_is_bounded(self):
+        for i in range(100):
+            self.ring.lookup(f'key{i}')
+        self.assertLessEqual(len(self.tracker.counts), 16)
+
+    def test_rebalance_spreads_requests(self):
+        # The ten hottest keys all live on one node
+        hot = list(self.ring.nodes[0])[:10]
+        for _ in range(20):
+            for key in hot:
+                self.ring.lookup(key)
+        counts = {node: len(keys) for node, keys in self.ring.nodes.items()}
+
+        moves = self.tracker.rebalance()
+        self.assertTrue(moves)
+        loads = [self.tracker.node_load(node) for node in self.ring.nodes]
+        self.assertLess(max(loads), 200)
+        self.assertLessEqual(max(loads) - min(loads), 40)
+        # Hot keys are swapped with cold ones, so key counts do not change
+        self.assertEqual({node: len(keys) for node, keys in self.ring.nodes.items()}, counts)
+        self.assertTrue(all(self.ring.keys[key] == destination for key, _, destination in moves))
+
+    def test_rebalance_through_concurrent_ring(self):
+        self.tracker.detach()
+        shared = ConcurrentRing(self.ring, shards=8)
+        self.tracker.attach(shared)
+        hot = list(self.ring.nodes[0])[:10]
+        for _ in range(20):
+            for key in hot:
+                shared.lookup(key)
+        self.assertEqual(self.tracker.lookups, 200)
+
+        version = shared.snapshot.version
+        moves = self.tracker.rebalance()
+        self.assertTrue(moves)
+        # The moves are published to readers in one snapshot
+        self.assertEqual(shared.snapshot.version, version + 1)
+        for key, _, destination in moves:
+            self.assertEqual(shared.lookup(key), destination)
+        self.tracker.detach()
+        self.assertNotIn('lookup', shared.__dict__)
+
+    def test_concurrent_lookups(self):
+        self.tracker.detach()
+        shared = ConcurrentRing(self.ring, shards=8)
+        self.tracker.rebalance_every = 300
+        self.tracker.attach(shared)
+        errors = []
+
+        def read(offset):
+            try:
+                for i in range(3000):
+                    shared.lookup(f'key{(i * 7 + offset) % 100}')
+            except Exception as error:
+                errors.append(error)
+
+        # Switch threads often, so that lookups interleave with pruning and rebalancing
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=read, args=(offset,)) for offset in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        # No lookup is lost, and every key is still where the ring maps it
+        self.assertEqual(self.tracker.lookups, 8 * 3000)
+        for key, node in self.ring.keys.items():
+            self.assertEqual(shared.lookup(key), node)
+
+    def test_automatic_rebalance_and_detach(self):
+        self.tracker.rebalance_every = 50
+        hot = list(self.ring.nodes[1])[:4]
+        for _ in range(50):
+            for key in hot:
+                self.ring.lookup(key)
+        self.assertGreater(len({self.ring.keys[key] for key in hot}), 1)
+
+        self.tracker.detach()
+        self.ring.lookup(hot[0])
+        self.assertEqual(self.tracker.lookups, 200)
+
+    def test_detach_keeps_instrumentation(self):
+        for detach_tracker_first in (True, False):
+            instrumentation = Instrumentation()
+            instrumentation.attach(self.ring)
+            self.ring.lookup('key0')
+            if detach_tracker_first:
+                self.tracker.detach()
+            else:
+                instrumentation.detach(self.ring)
+            lookups = (self.tracker.lookups, instrumentation.counters['lookup'])
+            self.ring.lookup('key0')
+            # Only the detached one stops counting
+            self.assertEqual(self.tracker.lookups, lookups[0] + (not detach_tracker_first))
+            self.assertEqual(instrumentation.counters['lookup'], lookups[1] + detach_tracker_first)
+
+            if detach_tracker_first:
+                instrumentation.detach(self.ring)
+            else:
+                self.tracker.detach()
+            self.assertNotIn('lookup', self.ring.__dict__)
+            self.tracker.attach(self.ring)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import subprocess
+import sys
+import os
+
+# The package root, so that subprocesses can import balanced_ring
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Import time budget in seconds, generous enough for slow CI machines
+IMPORT_BUDGET = 0.1
+
+def run(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout
+
+class TestImport(unittest.TestCase):
+
+    def test_package_import_is_lazy(self):
+        out = run("import sys, balanced_ring; print(sorted(m for m in sys.modules if m.startswith('balanced_ring')))")
+        self.assertEqual(out.strip(), "['balanced_ring']")
+
+    def test_modules_import_silently(self):
+        for module in ('ring', 'compact', 'self_balancing', 'sequence', 'traversal', 'instrumentation', 'snapshot', 'routing', 'persistence', 'hot_keys', 'hierarchical', 'service'):
+            out = run(f"import sys, balanced_ring.{module}; print('numpy' in sys.modules)")
+            self.assertEqual(out.strip(), 'False', module)
+
+    def test_import_budget(self):
+        code = ("import time; start = time.perf_counter(); "
+                "from balanced_ring import SelfBalancingRing, BalancedRing, Sequence; "
+                "print(time.perf_counter() - start)")
+        elapsed = min(float(run(code)) for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.instrumentation import Instrumentation
+from balanced_ring.self_balancing import SelfBalancingRing
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.instrumentation = Instrumentation(
+            on_node_join=lambda node: self.events.append(('join', node)),
+            on_node_leave=lambda node: self.events.append(('leave', node)),
+            on_keys_moved=lambda moves: self.events.append(('moved', len(moves))),
+        )
+        self.ring = SelfBalancingRing(list(range(3)), upper_bound=10, lower_bound=2, variance_factor=2)
+        self.instrumentation.attach(self.ring)
+
+    def test_counters_and_timings(self):
+        for i in range(40):
+            self.ring.insert_key(f'key{i}')
+        for i in range(40):
+            self.ring.lookup(f'key{i}')
+        self.ring.remove_key('key0')
+
+        counters = self.instrumentation.counters
+        self.assertEqual(counters['insert'], 40)
+        self.assertEqual(counters['lookup'], 40)
+        self.assertEqual(counters['remove'], 1)
+        self.assertEqual(counters['nodes_joined'], 1)
+        self.assertGreaterEqual(counters['insert_steps'], 40)
+        self.assertEqual(self.instrumentation.timings['lookup'].count, 40)
+        self.assertGreater(self.instrumentation.timings['insert'].percentile(99), 0)
+        self.assertIn(('join', 3), self.events)
+
+    def test_node_events(self):
+        self.ring.insert_keys(f'key{i}' for i in range(12))
+        self.ring.remove_node(0)
+        self.assertEqual(self.events[-2:], [('moved', 4), ('leave', 0)])
+        self.assertEqual(self.instrumentation.counters['rebalance'], 1)
+
+    def test_underflow_events_match_migration_order(self):
+        self.ring.insert_keys(f'key{i}' for i in range(12))
+        self.ring.remove_keys(list(self.ring.nodes[0])[:3])
+        self.assertEqual(self.events[-2:], [('moved', 1), ('leave', 0)])
+
+    def test_detach(self):
+        self.instrumentation.detach(self.ring)
+        self.ring.insert_key('key')
+        self.assertNotIn('insert', self.instrumentation.counters)
+        self.assertIsNone(self.ring.instrumentation)
+
+if __name__ == '__main__':
+    unittest.main()
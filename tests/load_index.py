@@ -0,0 +1,47 @@
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.load_index import LoadIndex
+from balanced_ring.self_balancing import SelfBalancingRing
+
+class TestLoadIndex(unittest.TestCase):
+
+    def test_least_loaded(self):
+        index = LoadIndex(range(3))
+        index.adjust(0, 2)
+        index.adjust(1, 1)
+        index.adjust(2, 3)
+        self.assertEqual(index.least_loaded(), 1)
+        index.remove(1)
+        self.assertEqual(index.least_loaded(), 0)
+        index.adjust(0, 5)
+        self.assertEqual(index.least_loaded(), 2)
+        index.remove(0)
+        index.remove(2)
+        self.assertIsNone(index.least_loaded())
+
+    def test_tracks_ring_under_churn(self):
+        random.seed(7)
+        ring = SelfBalancingRing(list(range(4)), upper_bound=20, lower_bound=2, variance_factor=2)
+        for i in range(300):
+            ring.insert_key(f'key{i}')
+        for _ in range(500):
+            key = random.choice(list(ring.keys))
+            if random.random() < 0.5:
+                ring.remove_key(key)
+                ring.insert_key(key)
+            else:
+                ring.remap(key, random.choice(list(ring.nodes)))
+
+        self.assertEqual(ring.load_index.loads, {node: len(keys) for node, keys in ring.nodes.items()})
+        self.assertEqual(ring.load_index.minimum, min(len(keys) for keys in ring.nodes.values()))
+        for key, node in ring.keys.items():
+            self.assertIn(key, ring.nodes[node])
+
+if __name__ == '__main__':
+    unittest.main()
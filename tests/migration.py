@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+
+class TestMigrationPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SelfBalancingRing(list(range(3)), upper_bound=35, lower_bound=5, variance_factor=2)
+        self.ring.insert_keys(f'key{i}' for i in range(90))
+
+    def test_dry_run_leaves_ring_unchanged(self):
+        keys = dict(self.ring.keys)
+        plan = self.ring.insert_node(3, dry_run=True)
+        self.assertEqual(plan.add, [3])
+        self.assertEqual(self.ring.keys, keys)
+        self.assertNotIn(3, self.ring.nodes)
+
+    def test_join_moves_fewest_keys(self):
+        plan = self.ring.insert_node(3)
+        # 90 keys over 4 nodes within a spread of 2 need at least 21 keys on the new node
+        self.assertEqual(plan.cost, 21)
+        self.assertTrue(all(destination == 3 for _, _, destination in plan.moves))
+        sizes = [len(keys) for keys in self.ring.nodes.values()]
+        self.assertLessEqual(max(sizes) - min(sizes), self.ring.variance_factor)
+
+    def test_leave_moves_only_its_keys(self):
+        plan = self.ring.remove_node(1)
+        self.assertEqual(plan.cost, 30)
+        self.assertTrue(all(source == 1 for _, source, _ in plan.moves))
+        self.assertEqual(sorted(len(keys) for keys in self.ring.nodes.values()), [30, 30, 30])
+
+    def test_leave_adds_nodes_when_full(self):
+        plan = self.ring.plan_migration(remove=[0, 1])
+        self.assertEqual(plan.add, [3, 4])
+        self.ring.apply_migration(plan)
+        self.assertEqual(self.ring.ring, [2, 3, 4])
+        self.assertEqual(len(self.ring.keys), 90)
+
+    def test_stale_plan_is_rejected(self):
+        plan = self.ring.plan_migration(add=[3])
+        key, source, _ = plan.moves[0]
+        self.ring.remap(key, (source + 1) % 3)
+        keys = dict(self.ring.keys)
+        with self.assertRaises(ValueError):
+            self.ring.apply_migration(plan)
+        self.assertEqual(self.ring.keys, keys)
+        self.assertNotIn(3, self.ring.ring)
+
+if __name__ == '__main__':
+    unittest.main()
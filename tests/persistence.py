@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+from balanced_ring.persistence import load_snapshot, save_snapshot
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SelfBalancingRing(list(range(8)), upper_bound=100, lower_bound=3, variance_factor=2)
+        for i in range(500):
+            self.ring.insert_key(f'key{i}')
+        for i in range(0, 500, 7):
+            self.ring.remove_key(f'key{i}')
+        self.ring.insert_key('clé ✓')
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'ring.snapshot')
+        save_snapshot(self.ring, self.path)
+
+    def test_mapped_lookup(self):
+        with load_snapshot(self.path) as mapped:
+            self.assertEqual(len(mapped), len(self.ring.keys))
+            for key, node in self.ring.keys.items():
+                self.assertEqual(mapped.lookup(key), node)
+            self.assertNotIn('key0', mapped)
+            with self.assertRaises(KeyError):
+                mapped.lookup('key0')
+
+    def test_restore_continues_identically(self):
+        with load_snapshot(self.path) as mapped:
+            restored = mapped.restore()
+        self.assertEqual(restored.keys, self.ring.keys)
+        self.assertEqual((restored.current, restored.i), (self.ring.current, self.ring.i))
+        self.assertEqual({node: list(keys) for node, keys in restored.nodes.items()},
+                         {node: list(keys) for node, keys in self.ring.nodes.items()})
+
+        # The same inserts after a restart give the same assignment
+        for i in range(500, 800):
+            self.ring.insert_key(f'key{i}')
+            restored.insert_key(f'key{i}')
+        self.assertEqual(restored.keys, self.ring.keys)
+
+    def test_weights(self):
+        self.ring.insert_node(20, weight=2.5)
+        save_snapshot(self.ring, self.path)
+        with load_snapshot(self.path) as mapped:
+            restored = mapped.restore()
+        self.assertEqual(restored.weights, {20: 2.5})
+        self.assertEqual(restored.load_index.least_loaded(), self.ring.load_index.least_loaded())
+
+    def test_empty_ring(self):
+        save_snapshot(SelfBalancingRing([], 10, 0, 1), self.path)
+        with load_snapshot(self.path) as mapped:
+            self.assertEqual(len(mapped), 0)
+            self.assertNotIn('key', mapped)
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a snapshot' * 10)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+    def test_rejects_non_str_keys(self):
+        ring = SelfBalancingRing([0], 10, 0, 1)
+        ring.insert_key(1)
+        with self.assertRaises(TypeError):
+            save_snapshot(ring, self.path)
+
+    def test_failed_save_leaves_no_partial_file(self):
+        ring = SelfBalancingRing(['a', 'b'], 10, 0, 1)
+        ring.insert_key('key')
+        with self.assertRaises(TypeError):
+            save_snapshot(ring, self.path)  # Nodes must be int
+        self.assertFalse(os.path.exists(f'{self.path}.tmp'))
+        with load_snapshot(self.path) as mapped:
+            self.assertEqual(len(mapped), len(self.ring.keys))
+
+if __name__ == '__main__':
+    unittest.main()
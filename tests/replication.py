@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+
+class TestReplication(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SelfBalancingRing(list(range(6)), upper_bound=50, lower_bound=2, variance_factor=2, replication=3)
+        self.ring.insert_keys(f'key{i}' for i in range(120))
+
+    def assertReplicated(self):
+        for key, node in self.ring.keys.items():
+            replicas = self.ring.replicas(key)
+            self.assertEqual(replicas[0], node)
+            self.assertEqual(len(set(replicas)), min(3, len(self.ring.ring)))
+
+    def test_replicas_on_partners(self):
+        self.assertReplicated()
+        node = self.ring.keys['key0']
+        index = self.ring.ring.index(node)
+        # The first copy goes to the +k partner
+        self.assertEqual(self.ring.replicas('key0')[1], self.ring.ring[(index + self.ring.k) % 6])
+        with self.assertRaises(KeyError):
+            self.ring.replicas('missing')
+
+    def test_route_read_spreads_reads(self):
+        for _ in range(300):
+            self.ring.route_read('key0')
+        reads = [self.ring.reads.get(node, 0) for node in self.ring.replicas('key0')]
+        self.assertEqual(reads, [100, 100, 100])
+
+    def test_route_read_seeds_joining_nodes(self):
+        for _ in range(50):
+            for key in self.ring.keys:
+                self.ring.route_read(key)
+        self.ring.insert_node(6)
+        keys = [key for key in self.ring.keys if 6 in self.ring.replicas(key)]
+        routed = [self.ring.route_read(key) for _ in range(5) for key in keys]
+        # The new node gets about its share of the reads, not all of them until it catches up
+        self.assertLess(routed.count(6), len(routed) / 2)
+
+    def test_replicas_stay_distinct_through_rebalancing(self):
+        self.ring.insert_node(6)
+        self.assertReplicated()
+        self.ring.remove_node(2)
+        self.assertReplicated()
+        self.ring.remove_keys(list(self.ring.nodes[0]))
+        self.assertReplicated()
+        self.ring.remove_keys([key for key in list(self.ring.keys) if key != 'key0'])
+        self.assertEqual(len(self.ring.ring), 1)
+        self.assertEqual(self.ring.replicas('key0'), (self.ring.ring[0],))
+
+    def test_stored_counts_replicas(self):
+        stored = {node: self.ring.stored(node) for node in self.ring.ring}
+        self.assertEqual(sum(stored.values()), 3 * len(self.ring.keys))
+        for node, copies in stored.items():
+            self.assertEqual(copies, sum(node in self.ring.replicas(key) for key in self.ring.keys))
+        with self.assertRaises(ValueError):
+            self.ring.stored(99)
+
+    def test_single_copy_by_default(self):
+        ring = SelfBalancingRing([0, 1], 10, 0, 1)
+        ring.insert_key('key')
+        self.assertEqual(ring.replicas('key'), (ring.lookup('key'),))
+        self.assertEqual(ring.route_read('key'), ring.lookup('key'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import pickle
+import random
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.routing import HashRing, RingDescriptor, home_index, key_hash
+
+class TestHashRing(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = HashRing(list(range(8)), upper_bound=400)
+        for i in range(2000):
+            self.ring.insert_key(f'key{i}')
+
+    def assertRoutable(self):
+        descriptor = self.ring.descriptor()
+        for key, node in self.ring.keys.items():
+            self.assertEqual(descriptor.lookup(key), node, key)
+
+    def test_descriptor_routes_every_key(self):
+        self.assertRoutable()
+        # The descriptor holds the exceptions only
+        self.assertLess(len(self.ring.descriptor().overflow), len(self.ring.keys) // 10)
+
+    def test_bounded_loads(self):
+        capacity = self.ring._capacity(len(self.ring.keys))
+        self.assertLessEqual(max(self.ring.load_index.loads.values()), capacity)
+
+    def test_remove_keys(self):
+        for i in range(0, 2000, 3):
+            self.ring.remove_key(f'key{i}')
+        self.assertNotIn('key0', self.ring.keys)
+        self.assertRoutable()
+        with self.assertRaises(KeyError):
+            self.ring.remove_key('key0')
+
+    def test_insert_node_moves_few_keys(self):
+        plan = self.ring.insert_node(8)
+        self.assertRoutable()
+        # Roughly the new node's share moves, not the whole ring
+        self.assertLess(plan.cost, len(self.ring.keys) // 4)
+        self.assertGreater(sum(destination == 8 for _, _, destination in plan.moves), plan.cost // 2)
+
+    def test_remove_node(self):
+        plan = self.ring.remove_node(3)
+        self.assertNotIn(3, self.ring.ring)
+        self.assertRoutable()
+        self.assertLess(plan.cost, len(self.ring.keys) // 2)
+        with self.assertRaises(ValueError):
+            self.ring.remove_node(3)
+
+    def test_grows_at_upper_bound(self):
+        ring = HashRing([0], upper_bound=10)
+        for i in range(95):
+            ring.insert_key(i)
+        self.assertGreaterEqual(len(ring.ring), 10)
+        self.assertLessEqual(max(ring.load_index.loads.values()), 10)
+        descriptor = ring.descriptor()
+        self.assertTrue(all(descriptor.lookup(key) == node for key, node in ring.keys.items()))
+
+    def test_descriptor_is_independent_and_picklable(self):
+        descriptor = pickle.loads(pickle.dumps(self.ring.descriptor()))
+        version = descriptor.version
+        self.ring.insert_node(8)
+        self.assertGreater(self.ring.version, version)
+        self.assertEqual(descriptor.nodes, tuple(range(8)))
+
+    def test_churn_keeps_indexes_consistent(self):
+        random.seed(3)
+        ring = self.ring = HashRing(list(range(4)), upper_bound=30)
+        serial = 0
+        for _ in range(3000):
+            roll = random.random()
+            if roll < 0.6 or not ring.keys:
+                ring.insert_key(f'key{serial}')
+                serial += 1
+            elif roll < 0.95:
+                ring.remove_key(random.choice(list(ring.keys)))
+            elif roll < 0.98:
+                ring.insert_node(max(ring.ring) + 1)
+            elif len(ring.ring) > 1:
+                ring.remove_node(random.choice(ring.ring))
+
+        n = len(ring.ring)
+        self.assertEqual(set(ring.nodes), set(ring.ring))
+        self.assertEqual({key: node for node, keys in ring.nodes.items() for key in keys}, ring.keys)
+        self.assertEqual(ring.load_index.loads, {node: len(keys) for node, keys in ring.nodes.items()})
+        self.assertLessEqual(max(ring.load_index.loads.values()), ring.upper_bound)
+        homes = {key: ring.ring[home_index(key_hash(key), n)] for key in ring.keys}
+        self.assertEqual(ring.overflow, {key: node for key, node in ring.keys.items() if homes[key] != node})
+        self.assertEqual(sum(map(len, ring._homes)), len(ring.keys))
+        for index, keys in enumerate(ring._homes):
+            self.assertTrue(all(ring.ring[index] == homes[key] for key in keys))
+        self.assertEqual(sum(map(len, ring._jumps.values())), len(ring.keys))
+        self.assertTrue(all(len(keys) for keys in ring._jumps.values()))
+        self.assertRoutable()
+
+    def test_hash_is_stable(self):
+        self.assertEqual(key_hash('key'), key_hash(b'key'))
+        self.assertEqual(key_hash(42), key_hash('42'))
+        # Fixed across processes and runs, unlike hash()
+        self.assertEqual(key_hash('key'), 0xf54ca9c3adcc7cce)
+
+    def test_home_index_is_consistent(self):
+        hashes = [key_hash(i) for i in range(1000)]
+        for h in hashes:
+            index = home_index(h, 10)
+            self.assertIn(home_index(h, 11), (index, 10))
+        self.assertEqual(RingDescriptor([5]).lookup('anything'), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.ring import BalancedRing
+from balanced_ring.self_balancing import SelfBalancingRing
+from balanced_ring.sequence import Sequence
+
+class TestSeek(unittest.TestCase):
+
+    def test_balanced_ring_seek(self):
+        for size in range(1, 12):
+            ring = BalancedRing(size)
+            for i in range(1, 50):
+                ring.next()
+                self.assertEqual(ring.position_at(i), ring.current)
+                self.assertEqual(BalancedRing(size).seek(i), ring.current)
+
+    def test_balanced_ring_seek_back(self):
+        ring = BalancedRing(9)
+        ring.seek(37)
+        expected = BalancedRing(9)
+        expected.seek(37)
+        for _ in range(13):
+            expected.previous()
+        self.assertEqual(ring.seek_back(13), expected.current)
+        self.assertEqual(ring.i, expected.i)
+
+    def test_sequence_seek(self):
+        for n in range(1, 20):
+            s = Sequence(n)
+            for i in range(1, 50):
+                s.next()
+                self.assertEqual(s.position_at(i), s.current)
+            fresh = Sequence(n)
+            fresh.seek(49)
+            self.assertEqual(fresh.next(), s.next())
+
+    def test_self_balancing_ring_seek(self):
+        ring = SelfBalancingRing(list(range(7)), upper_bound=10, lower_bound=0, variance_factor=2)
+        for i in range(1, 50):
+            ring.next()
+            self.assertEqual(ring.position_at(i), ring.current)
+        other = SelfBalancingRing(list(range(7)), upper_bound=10, lower_bound=0, variance_factor=2)
+        other.seek(49)
+        for _ in range(20):
+            ring.previous()
+        self.assertEqual(other.seek_back(20), ring.current)
+        self.assertEqual(other.next(), ring.next())
+
+if __name__ == '__main__':
+    unittest.main()
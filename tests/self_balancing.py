@@ -6,13 +6,13 @@ import os
 # Add the parent directory to the system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from SelfBalancingRing import SelfBalancingRing
+from balanced_ring.self_balancing import SelfBalancingRing
 
 class TestSelfBalancingRing(unittest.TestCase):
 
     def setUp(self):
         initial_nodes = list(range(10))
-        self.ring = SelfBalancingRing(initial_nodes, upper_bound=10, lower_bound=3)
+        self.ring = SelfBalancingRing(initial_nodes, upper_bound=10, lower_bound=3, variance_factor=2)
 
     def test_insert_key(self):
         for i in range(100):
@@ -42,6 +42,8 @@ class TestSelfBalancingRing(unittest.TestCase):
             self.assertGreaterEqual(len(keys), self.ring.lower_bound)
 
     def test_add_remove_nodes(self):
+        for i in range(100):
+            self.ring.insert_key(f'key{i}')
         for i in range(10, 15):
             self.ring.insert_node(i)
         for i in range(5):
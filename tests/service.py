@@ -0,0 +1,113 @@
+import unittest
+import tempfile
+import copy
+import asyncio
+import threading
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+from balanced_ring.service import RingClient, RingServer
+
+class TestRingService(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SelfBalancingRing(list(range(8)), upper_bound=100, lower_bound=0, variance_factor=2)
+        self.ring.insert_keys(f'key{i}' for i in range(500))
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.client = self.serve(os.path.join(directory.name, 'ring.sock'))
+
+    def serve(self, address):
+        """
+        Serves the ring from an event loop in a background thread, and returns a client for it.
+        """
+        loop = asyncio.new_event_loop()
+        server = RingServer(self.ring, address)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        async def finish():
+            # The client is closed first, so its connections are ending
+            server.close()
+            connections = asyncio.all_tasks() - {asyncio.current_task()}
+            if connections:
+                await asyncio.wait(connections)
+
+        def stop():
+            asyncio.run_coroutine_threadsafe(finish(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+        self.addCleanup(stop)
+        client = RingClient(server.address, pool_size=2, batch_size=64, window=4)
+        self.addCleanup(client.close)
+        return client
+
+    def test_lookup(self):
+        keys = [f'key{i}' for i in range(500)]
+        self.assertEqual(self.client.lookup_many(keys), [self.ring.keys[key] for key in keys])
+        self.assertEqual(self.client.lookup('key7'), self.ring.keys['key7'])
+        self.assertEqual(self.client.lookup_many(['key1', 'missing']), [self.ring.keys['key1'], None])
+        self.assertEqual(self.client.lookup_many([]), [])
+        with self.assertRaises(KeyError):
+            self.client.lookup('missing')
+
+    def test_tcp(self):
+        client = self.serve(('127.0.0.1', 0))
+        keys = [f'key{i}' for i in range(500)]
+        self.assertEqual(client.lookup_many(keys), [self.ring.keys[key] for key in keys])
+
+    def test_changes(self):
+        self.client.insert_keys(f'new{i}' for i in range(200))
+        self.client.insert_key('clé ✓')
+        self.assertEqual(self.client.lookup('clé ✓'), self.ring.keys['clé ✓'])
+        self.client.remove_keys(f'key{i}' for i in range(100))
+        self.client.remove_key('key100')
+        self.assertEqual(len(self.ring.keys), 600)
+        self.assertIsNone(self.client.lookup_many(['key0'])[0])
+
+        node = (self.ring.keys['key200'] + 1) % 8
+        self.client.remap('key200', node)
+        self.assertEqual(self.client.lookup('key200'), node)
+
+    def test_single_insert_probes_like_insert_key(self):
+        expected = copy.deepcopy(self.ring)
+        for i in range(20):
+            self.client.insert_key(f'new{i}')
+            expected.insert_key(f'new{i}')
+        self.assertEqual(self.ring.keys, expected.keys)
+        self.client.remove_key('new0')
+        self.assertNotIn('new0', self.ring.keys)
+
+    def test_stops_after_failed_batch(self):
+        client = RingClient(self.client.address, batch_size=10, window=1)
+        self.addCleanup(client.close)
+        keys = [f'new{i}' for i in range(50)]
+        keys[15] = 'key0'  # Already in the ring, so the second batch fails
+        with self.assertRaises(ValueError):
+            client.insert_keys(keys)
+        self.assertIn('new0', self.ring.keys)
+        self.assertNotIn('new20', self.ring.keys)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.client.insert_key('key0')
+        with self.assertRaises(KeyError):
+            self.client.remove_key('missing')
+        with self.assertRaises(ValueError):
+            self.client.remap('key0', 99)
+        with self.assertRaises(ValueError):
+            self.client.lookup('bad\0key')
+
+        # The connections are still usable afterwards
+        self.assertEqual(self.client.lookup('key0'), self.ring.keys['key0'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import random
+import unittest
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from balanced_ring.self_balancing import SelfBalancingRing
+
+class TestWeights(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SelfBalancingRing([0, 1, 2, 3], upper_bound=20, lower_bound=2, variance_factor=2,
+                                      weights={1: 2, 3: 0.5})
+
+    def assertProportional(self, ring):
+        per_weight = [len(keys) / ring.weights.get(node, 1) for node, keys in ring.nodes.items()]
+        self.assertLessEqual(max(per_weight) - min(per_weight), ring.variance_factor + 2)
+        for node, keys in ring.nodes.items():
+            self.assertLessEqual(len(keys), ring.upper_bound * ring.weights.get(node, 1))
+
+    def test_insert_key_scales_with_weight(self):
+        for i in range(80):
+            self.ring.insert_key(f'key{i}')
+        self.assertEqual(len(self.ring.ring), 4)
+        self.assertProportional(self.ring)
+        self.assertGreater(len(self.ring.nodes[1]), len(self.ring.nodes[0]))
+        self.assertLess(len(self.ring.nodes[3]), len(self.ring.nodes[0]))
+
+    def test_insert_keys_scales_with_weight(self):
+        self.ring.insert_keys(f'key{i}' for i in range(90))
+        self.assertEqual(len(self.ring.ring), 4)
+        self.assertEqual([len(self.ring.nodes[node]) for node in range(4)], [20, 40, 20, 10])
+
+    def test_weighted_node_join(self):
+        self.ring.insert_keys(f'key{i}' for i in range(60))
+        plan = self.ring.insert_node(4, weight=3)
+        self.assertEqual(self.ring.weights[4], 3)
+        self.assertTrue(all(destination == 4 for _, _, destination in plan.moves))
+        self.assertProportional(self.ring)
+
+    def test_set_weight(self):
+        self.ring.insert_keys(f'key{i}' for i in range(60))
+        plan = self.ring.set_weight(1, 1, dry_run=True)
+        self.assertEqual(self.ring.weights[1], 2)
+        self.assertTrue(all(source == 1 for _, source, _ in plan.moves))
+        self.ring.apply_migration(plan)
+        self.assertNotIn(1, self.ring.weights)
+        self.assertProportional(self.ring)
+        self.assertEqual(self.ring.load_index.least_loaded(), min(self.ring.nodes, key=lambda node: len(self.ring.nodes[node])))
+
+    def test_lower_bound_scales_with_weight(self):
+        self.ring.insert_keys(f'key{i}' for i in range(60))
+        keys = list(self.ring.nodes[1])
+        for key in keys[:len(keys) - 3]:
+            self.ring.remove_key(key)
+        # Three keys are under the lower bound of a node of weight 2
+        self.assertNotIn(1, self.ring.nodes)
+        self.assertNotIn(1, self.ring.weights)
+
+    def test_bulk_remove_drops_weight(self):
+        self.ring.insert_keys(f'key{i}' for i in range(60))
+        keys = list(self.ring.nodes[1])
+        self.ring.remove_keys(keys[:len(keys) - 3])
+        self.assertNotIn(1, self.ring.nodes)
+        self.assertNotIn(1, self.ring.weights)
+        self.assertNotIn(1, self.ring.load_index.weights)
+
+    def test_fuzz_fractional_weights(self):
+        rng = random.Random(7)
+        for variance_factor in (0, 1, 3):
+            ring = SelfBalancingRing([0, 1], upper_bound=8, lower_bound=0, variance_factor=variance_factor,
+                                     weights={0: 0.5, 1: 0.5})
+            apply_migration = ring.apply_migration
+            def checked(plan):
+                for key, source, destination in plan.moves:
+                    self.assertNotEqual(source, destination, key)
+                return apply_migration(plan)
+            ring.apply_migration = checked
+            keys = 0
+            for step in range(300):
+                op = rng.random()
+                if op < 0.3:
+                    ring.insert_key(f'key{keys}')
+                    keys += 1
+                elif op < 0.45:
+                    count = rng.randint(1, 6)
+                    ring.insert_keys([f'key{keys + i}' for i in range(count)])
+                    keys += count
+                elif op < 0.6 and ring.keys:
+                    ring.remove_key(rng.choice(list(ring.keys)))
+                elif op < 0.7 and ring.keys:
+                    ring.remove_keys(rng.sample(list(ring.keys), min(len(ring.keys), rng.randint(1, 4))))
+                elif op < 0.8:
+                    ring.insert_node(max(ring.nodes, default=-1) + 1, weight=rng.choice((0.25, 0.5, 0.75, 1.5)))
+                elif op < 0.9 and len(ring.nodes) > 1:
+                    ring.remove_node(rng.choice(list(ring.nodes)))
+                elif ring.nodes:
+                    ring.set_weight(rng.choice(list(ring.nodes)), rng.choice((0.5, 0.75, 1, 1.25)))
+                for node, keys_held in ring.nodes.items():
+                    self.assertLessEqual(len(keys_held), ring._limit(node), (variance_factor, step))
+
+    def test_invalid_weights(self):
+        with self.assertRaises(ValueError):
+            SelfBalancingRing([0], 10, 0, 1, weights={0: 0})
+        with self.assertRaises(ValueError):
+            self.ring.set_weight(9, 2)
+        with self.assertRaises(ValueError):
+            self.ring.insert_node(4, weight=-1)
+
+if __name__ == '__main__':
+    unittest.main()